@@ -449,8 +449,8 @@ export const studentsApi = {
     class_id?: string;
     section_id?: string;
     session_id?: string;
-  }>): Promise<Student[]> => {
-    return api.post<Student[]>('/students/bulk/', { students });
+  }>): Promise<Array<{ id: string; student_id: string; roll_no: string }>> => {
+    return api.post<Array<{ id: string; student_id: string; roll_no: string }>>('/students/bulk/', { students });
   },
 };
 
@@ -6,3 +6,8 @@ class CoreServicesConfig(AppConfig):
 
     def ready(self):
         import core_services.signals
+        from django.contrib.auth.password_validation import get_default_password_validators
+
+        # Build the (cached) validators now so CommonPasswordValidator reads its
+        # word list at startup rather than during the first password change
+        get_default_password_validators()
@@ -0,0 +1,32 @@
+"""
+Custom DRF authentication classes.
+"""
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class _ProfileUserModel:
+    """
+    Stands in for the user model inside JWTAuthentication.get_user: same
+    DoesNotExist, but `objects` joins the admin/teacher profiles.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.DoesNotExist = model.DoesNotExist
+
+    @property
+    def objects(self):
+        return self.model._default_manager.select_related('teacher_profile', 'admin_profile')
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that loads the admin/teacher profile in the same query
+    as the user, so permission checks reading `user.teacher_profile` don't
+    issue a second SELECT on every request. simplejwt's own get_user still
+    runs, so its active-user and token-revocation checks apply unchanged.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user_model = _ProfileUserModel(self.user_model)
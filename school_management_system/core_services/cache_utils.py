@@ -2,12 +2,33 @@
 Cache utilities for API responses.
 Provides decorators and helpers for caching ViewSet responses.
 """
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import wraps
+from urllib.parse import urlencode
 from django.core.cache import cache
 from django.conf import settings
-from rest_framework.response import Response
-import hashlib
-import json
+from django.http import HttpResponse, HttpResponseNotModified
+import logging
+import orjson
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+try:
+    from xxhash import xxh3_64_intdigest as fast_hash
+except ImportError:
+    _FNV64_OFFSET = 0xcbf29ce484222325
+    _FNV64_PRIME = 0x100000001b3
+    _MASK64 = 0xffffffffffffffff
+    
+    def fast_hash(data: bytes) -> int:
+        """64-bit FNV-1a, used when xxhash is not installed."""
+        h = _FNV64_OFFSET
+        for byte in data:
+            h = ((h ^ byte) * _FNV64_PRIME) & _MASK64
+        return h
 
 
 # Cache TTL settings
@@ -15,48 +36,235 @@ CACHE_TTL_SHORT = getattr(settings, 'CACHE_TTL_SHORT', 60)
 CACHE_TTL_MEDIUM = getattr(settings, 'CACHE_TTL_MEDIUM', 300)
 CACHE_TTL_LONG = getattr(settings, 'CACHE_TTL_LONG', 900)
 
+# Dogpile lock settings (seconds)
+CACHE_LOCK_TIMEOUT = 10
+CACHE_LOCK_WAIT = 5
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
+# Write cache-miss results from a background thread so the response is not
+# blocked on the cache round trip. Only worth it for network backends (Redis).
+CACHE_ASYNC_WRITES = getattr(settings, 'CACHE_ASYNC_WRITES', False)
+_write_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-write') if CACHE_ASYNC_WRITES else None
+
+# Whether every worker sees the same cache. LocMemCache is private to each
+# process, so a version bump in one worker is invisible to the others.
+CACHE_IS_SHARED = settings.CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
 
 def make_cache_key(prefix: str, *args, **kwargs) -> str:
     """Generate a unique cache key from prefix and arguments."""
-    key_data = json.dumps({'args': args, 'kwargs': kwargs}, sort_keys=True, default=str)
-    key_hash = hashlib.md5(key_data.encode()).hexdigest()[:16]
-    return f"{prefix}:{key_hash}"
+    key_data = orjson.dumps({'args': args, 'kwargs': kwargs}, option=orjson.OPT_SORT_KEYS, default=str)
+    return f"{prefix}:{fast_hash(key_data):016x}"
+
+
+def canonical_query_string(query_params) -> str:
+    """
+    Stable flat representation of a QueryDict, independent of key order.
+    Values keep their order (a repeated key's last value is what .get() sees)
+    and are percent-encoded, so distinct queries never share a string.
+    """
+    return urlencode(sorted(query_params.lists()), doseq=True)
+
+
+def make_request_cache_key(prefix: str, request, pk=None, user_id=None) -> str:
+    """
+    Build the cache key for a GET request from its path, query string and pk.
+    Hashes a flat string directly instead of JSON-encoding a dict of arguments.
+    Pass user_id for responses that depend on the requesting user.
+    """
+    key_data = f"{get_cache_version(prefix)}|{request.path}|{canonical_query_string(request.query_params)}|{pk}|{user_id}"
+    return f"{prefix}:{fast_hash(key_data.encode()):016x}"
+
+
+def new_cache_version() -> str:
+    """A version token that is never reused, so stale entries can't match it again."""
+    return uuid.uuid4().hex
+
+
+def get_cache_version(prefix: str) -> str:
+    """
+    Current invalidation version for a prefix (see invalidate_cache_prefix).
+    A missing (e.g. culled) version key is replaced by a fresh token rather
+    than a default, which orphans everything cached under the old one.
+    """
+    return cache.get_or_set(f"{prefix}:version", new_cache_version, None)
+
+
+def get_request_user_id(request):
+    """Primary key of the authenticated user, or None for anonymous requests."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+def is_cacheable_request(request) -> bool:
+    """Only JSON GET responses are cached; the browsable API renders HTML."""
+    renderer = getattr(request, 'accepted_renderer', None)
+    return request.method == 'GET' and renderer is not None and renderer.format == 'json'
+
+
+def render_for_cache(view, request, response):
+    """
+    Render a DRF response once and return a cacheable (status, body, content_type, etag) tuple.
+    Cache hits can then be served as raw bytes without re-running the renderer.
+    """
+    renderer = request.accepted_renderer
+    body = renderer.render(response.data, request.accepted_media_type, view.get_renderer_context())
+    content_type = request.accepted_media_type
+    if renderer.charset:
+        content_type = f"{content_type}; charset={renderer.charset}"
+    etag = f'W/"{fast_hash(body):016x}"'
+    return (response.status_code, body, content_type, etag)
+
+
+def etag_matches(request, etag) -> bool:
+    """Whether the client's If-None-Match header already covers this ETag."""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == '*' or etag in (tag.strip() for tag in if_none_match.split(','))
+
+
+def cached_http_response(cached, request):
+    """
+    Build an HttpResponse from a tuple produced by render_for_cache.
+    Returns 304 Not Modified when the client already holds this version.
+    """
+    status_code, body, content_type, etag = cached
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, status=status_code, content_type=content_type)
+    response['ETag'] = etag
+    return response
+
+
+def acquire_cache_lock(cache_key: str, timeout=CACHE_LOCK_TIMEOUT, wait=CACHE_LOCK_WAIT):
+    """
+    Acquire a short-lived lock for a cache key using cache.add, which is atomic
+    on every backend. Returns the lock key, or None if `wait` seconds passed
+    without acquiring it (the caller then proceeds without the lock).
+    """
+    lock_key = f"{cache_key}:lock"
+    deadline = time.monotonic() + wait
+    acquired = cache.add(lock_key, 1, timeout)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(CACHE_LOCK_POLL_INTERVAL)
+        acquired = cache.add(lock_key, 1, timeout)
+    return lock_key if acquired else None
 
 
-def cache_response(timeout=CACHE_TTL_MEDIUM, key_prefix=None):
+@contextmanager
+def cache_lock(cache_key: str, timeout=CACHE_LOCK_TIMEOUT, wait=CACHE_LOCK_WAIT):
+    """
+    Short-lived lock around a cache-miss computation to avoid a dogpile.
+    Yields whether the lock was acquired.
+    """
+    lock_key = acquire_cache_lock(cache_key, timeout, wait)
+    try:
+        yield lock_key is not None
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
+
+
+def _store_and_unlock(cache_key, value, timeout, lock_key=None):
+    """
+    Write a cache entry, then release the lock guarding its computation.
+    Without the lock another worker may have stored the key already, so the
+    write only adds it if it is still missing (get_or_set semantics).
+    """
+    try:
+        if lock_key:
+            cache.set(cache_key, value, timeout)
+        else:
+            cache.add(cache_key, value, timeout)
+    except Exception:
+        logger.exception("Failed to write cache key %s", cache_key)
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
+
+
+def store_and_unlock(cache_key, value, timeout, lock_key=None):
+    """
+    Write a cache entry and release its lock, in the background when
+    CACHE_ASYNC_WRITES is enabled. Waiting workers keep polling the lock
+    until the write has landed, so they still read the fresh value.
+    """
+    if _write_executor is not None:
+        _write_executor.submit(_store_and_unlock, cache_key, value, timeout, lock_key)
+    else:
+        _store_and_unlock(cache_key, value, timeout, lock_key)
+
+
+def get_or_render_response(view, request, cache_key, timeout, compute):
+    """
+    Serve a cached rendered response, or run `compute` and cache its output.
+    Only one worker computes a missing key; the others wait and re-read it.
+    """
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached_http_response(cached, request)
+    
+    lock_key = acquire_cache_lock(cache_key)
+    try:
+        # Another worker may have populated the key while we waited
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached_http_response(cached, request)
+        
+        response = compute()
+        
+        # Cache successful responses as rendered bytes; the lock is handed
+        # over to the write so it is released only once the value is stored
+        if response.status_code == 200:
+            cached = render_for_cache(view, request, response)
+            response['ETag'] = cached[3]
+            store_and_unlock(cache_key, cached, timeout, lock_key)
+            lock_key = None
+        
+        return response
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
+
+
+def cache_response(timeout=CACHE_TTL_MEDIUM, key_prefix=None, include_user=False, public=False):
     """
     Decorator to cache ViewSet list/retrieve responses.
     Only caches GET requests. Automatically generates cache key from request params.
+    
+    Authenticated requests are not cached by default, since the key would not
+    distinguish users. Use include_user=True to cache per user, or public=True
+    when the response is the same for every user.
     """
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(self, request, *args, **kwargs):
-            # Only cache GET requests
-            if request.method != 'GET':
+            # Only cache JSON GET requests
+            if not is_cacheable_request(request):
+                return view_func(self, request, *args, **kwargs)
+            
+            user_id = get_request_user_id(request)
+            if user_id is not None and not (include_user or public):
                 return view_func(self, request, *args, **kwargs)
             
             # Generate cache key
             prefix = key_prefix or f"{self.__class__.__name__}:{view_func.__name__}"
-            cache_key = make_cache_key(
-                prefix,
-                path=request.path,
-                query=dict(request.query_params),
-                pk=kwargs.get('pk')
+            cache_key = make_request_cache_key(
+                prefix, request, pk=kwargs.get('pk'),
+                user_id=user_id if include_user else None
             )
             
-            # Try to get from cache
-            cached_data = cache.get(cache_key)
-            if cached_data is not None:
-                return Response(cached_data)
-            
-            # Get fresh response
-            response = view_func(self, request, *args, **kwargs)
-            
-            # Cache successful responses
-            if response.status_code == 200:
-                cache.set(cache_key, response.data, timeout)
-            
-            return response
+            return get_or_render_response(
+                self, request, cache_key, timeout,
+                lambda: view_func(self, request, *args, **kwargs)
+            )
         return wrapper
     return decorator
 
@@ -64,73 +272,63 @@ def cache_response(timeout=CACHE_TTL_MEDIUM, key_prefix=None):
 def invalidate_cache_prefix(prefix: str):
     """
     Invalidate all cache keys with a given prefix.
-    Note: This only works with cache backends that support key patterns (like Redis).
-    For LocMemCache, we track keys manually.
+    Every key built under the prefix embeds its version, so bumping the version
+    orphans all old entries at once on any backend (they expire via TTL).
     """
-    # For simple invalidation, we use versioned keys
-    version_key = f"{prefix}:version"
-    current_version = cache.get(version_key, 0)
-    cache.set(version_key, current_version + 1, None)
+    cache.set(f"{prefix}:version", new_cache_version(), None)
 
 
 class CacheMixin:
     """
     Mixin for ViewSets to add caching support.
     Override cache_key_prefix and cache_timeout in your ViewSet.
+    
+    Querysets are scoped to the requesting user's school, so entries are keyed
+    per user by default. Set cache_per_user = False for data shared by all users.
     """
     cache_key_prefix = None
     cache_timeout = CACHE_TTL_MEDIUM
+    cache_per_user = True
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Resolve the prefix once per class instead of on every request
+        cls._cache_prefix = cls.cache_key_prefix or cls.__name__
     
     def get_cache_key(self, request, pk=None):
         """Generate cache key for current request."""
-        prefix = self.cache_key_prefix or self.__class__.__name__
-        
-        # Get current cache version for this prefix
-        version_key = f"{prefix}:version"
-        current_version = cache.get(version_key, 0)
-        
-        return make_cache_key(
-            prefix,
-            version=current_version,
-            path=request.path,
-            query=dict(request.query_params),
-            pk=pk
-        )
+        cls = type(self)
+        user_id = get_request_user_id(request) if cls.cache_per_user else None
+        return make_request_cache_key(cls._cache_prefix, request, pk=pk, user_id=user_id)
     
     def list(self, request, *args, **kwargs):
         """Cached list view."""
-        cache_key = self.get_cache_key(request)
-        cached_data = cache.get(cache_key)
-        
-        if cached_data is not None:
-            return Response(cached_data)
+        if not is_cacheable_request(request):
+            return super().list(request, *args, **kwargs)
         
-        response = super().list(request, *args, **kwargs)
-        
-        if response.status_code == 200:
-            cache.set(cache_key, response.data, self.cache_timeout)
-        
-        return response
+        # Class-level settings are read once into locals on the hot path
+        timeout = type(self).cache_timeout
+        cache_key = self.get_cache_key(request)
+        return get_or_render_response(
+            self, request, cache_key, timeout,
+            lambda: super(CacheMixin, self).list(request, *args, **kwargs)
+        )
     
     def retrieve(self, request, *args, **kwargs):
         """Cached retrieve view."""
-        cache_key = self.get_cache_key(request, pk=kwargs.get('pk'))
-        cached_data = cache.get(cache_key)
+        if not is_cacheable_request(request):
+            return super().retrieve(request, *args, **kwargs)
         
-        if cached_data is not None:
-            return Response(cached_data)
-        
-        response = super().retrieve(request, *args, **kwargs)
-        
-        if response.status_code == 200:
-            cache.set(cache_key, response.data, self.cache_timeout)
-        
-        return response
+        timeout = type(self).cache_timeout
+        cache_key = self.get_cache_key(request, pk=kwargs.get('pk'))
+        return get_or_render_response(
+            self, request, cache_key, timeout,
+            lambda: super(CacheMixin, self).retrieve(request, *args, **kwargs)
+        )
     
     def invalidate_list_cache(self):
         """Invalidate list cache when data changes."""
-        prefix = self.cache_key_prefix or self.__class__.__name__
-        invalidate_cache_prefix(prefix)
+        invalidate_cache_prefix(self._cache_prefix)
     
     def perform_create(self, serializer):
         """Invalidate cache after create."""
@@ -158,79 +356,208 @@ CACHE_KEYS = {
     'cocurricular_subjects_list': 'cocurricular_subjects:list',
     'optional_subjects_list': 'optional_subjects:list',
     'teachers_list': 'teachers:list',
+    'class_config': 'class_config',
+    'pending_fees': 'pending_fees',
 }
 
+# Models whose rows appear in the combined per-class config payload
+# (ClassViewSet.get_config); a change to any of them bumps its version.
+CLASS_CONFIG_MODELS = {
+    'class', 'section', 'subject', 'optionalsubject', 'cocurricularsubject',
+    'classsubjectassignment', 'classoptionalconfig', 'classoptionalassignment',
+    'classcocurricularconfig', 'classmarksdistribution',
+}
 
-def get_cached_sessions():
-    """Get cached list of sessions."""
-    from .models import Session
-    from .serializers import SessionSerializer
-    
-    cache_key = CACHE_KEYS['sessions_list']
-    data = cache.get(cache_key)
+# Models that decide which students of a class/section have pending fees
+# (permissions.get_students_with_pending_fees).
+PENDING_FEES_MODELS = {'student', 'studentfee'}
+
+
+def cache_get_json(cache_key):
+    """Read a value stored by cache_set_json, or None on a miss."""
+    raw = cache.get(cache_key)
+    return orjson.loads(raw) if raw is not None else None
+
+
+def cache_set_json(cache_key, data, timeout):
+    """
+    Store JSON-shaped data as a single orjson-encoded bytes blob.
+    Cheaper to (de)serialize than pickling nested serializer output.
+    """
+    cache.set(cache_key, orjson.dumps(data, default=str), timeout)
+
+
+def get_or_build_json(cache_key, build, timeout=CACHE_TTL_LONG):
+    """Return cached JSON data, building it under a dogpile lock on a miss."""
+    data = cache_get_json(cache_key)
+    if data is not None:
+        return data
     
-    if data is None:
-        sessions = Session.objects.all()
-        data = SessionSerializer(sessions, many=True).data
-        cache.set(cache_key, data, CACHE_TTL_LONG)
+    with cache_lock(cache_key):
+        data = cache_get_json(cache_key)
+        if data is None:
+            data = build()
+            cache_set_json(cache_key, data, timeout)
     
     return data
 
 
-def get_cached_classes():
-    """Get cached list of classes."""
+def _build_sessions():
+    from .models import Session
+    from .serializers import SessionSerializer
+    return SessionSerializer(Session.objects.all(), many=True).data
+
+
+def _build_classes():
     from .models import Class
     from .serializers import ClassSerializer
+    return ClassSerializer(Class.objects.prefetch_related('sections').all(), many=True).data
+
+
+def _build_subjects():
+    from .models import Subject
+    from .serializers import SubjectSerializer
+    return SubjectSerializer(Subject.objects.all(), many=True).data
+
+
+# Lookup name -> (static cache key, builder) for get_cached_core_lookups
+CORE_LOOKUPS = {
+    'sessions': (CACHE_KEYS['sessions_list'], _build_sessions),
+    'classes': (CACHE_KEYS['classes_list'], _build_classes),
+    'subjects': (CACHE_KEYS['subjects_list'], _build_subjects),
+}
+
+
+# Per-process L1 copy of the lookup lists: lookup name -> (version, data).
+# Entries are revalidated against the shared version key on every read.
+_local_lookups = {}
+
+
+def get_cached_core_lookups(names=tuple(CORE_LOOKUPS)):
+    """
+    Get several cached lookup lists at once.
+    Versions and values are each read with a single get_many, so warming
+    multiple lists costs two cache round trips instead of two per list.
+    Lists whose version matches the per-process copy skip the shared cache.
+    Returns a dict of lookup name -> data (treat as read-only).
+    """
+    static_keys = {name: CORE_LOOKUPS[name][0] for name in names}
+    version_keys = {name: f"{key.split(':', 1)[0]}:version" for name, key in static_keys.items()}
+    versions = cache.get_many(version_keys.values())
     
-    cache_key = CACHE_KEYS['classes_list']
-    data = cache.get(cache_key)
+    result = {}
+    data_keys = {}
+    for name in names:
+        version = versions.get(version_keys[name])
+        if version is None:
+            version = get_cache_version(version_keys[name].rsplit(':', 1)[0])
+        local = _local_lookups.get(name)
+        if local is not None and local[0] == version:
+            result[name] = local[1]
+        else:
+            data_keys[name] = (version, f"{static_keys[name]}:v{version}")
     
-    if data is None:
-        classes = Class.objects.prefetch_related('sections').all()
-        data = ClassSerializer(classes, many=True).data
-        cache.set(cache_key, data, CACHE_TTL_LONG)
+    if not data_keys:
+        return result
     
-    return data
+    cached = cache.get_many([cache_key for _, cache_key in data_keys.values()])
+    for name, (version, cache_key) in data_keys.items():
+        raw = cached.get(cache_key)
+        if raw is not None:
+            data = orjson.loads(raw)
+        else:
+            data = get_or_build_json(cache_key, CORE_LOOKUPS[name][1])
+        _local_lookups[name] = (version, data)
+        result[name] = data
+    return result
+
+
+def get_cached_sessions():
+    """Get cached list of sessions."""
+    return get_cached_core_lookups(('sessions',))['sessions']
+
+
+def get_cached_classes():
+    """Get cached list of classes."""
+    return get_cached_core_lookups(('classes',))['classes']
 
 
 def get_cached_subjects():
     """Get cached list of subjects."""
-    from .models import Subject
-    from .serializers import SubjectSerializer
+    return get_cached_core_lookups(('subjects',))['subjects']
+
+
+# Per-process cache of the active Session: school id -> (sessions version, expiry, session).
+# Session save/delete bumps the version in the shared cache; the expiry bounds
+# how long an entry can outlive a bump that this process did not see.
+_active_sessions = {}
+
+
+def get_active_session(school_id=None):
+    """
+    Get the active Session (for one school, if given), cached per process.
+    With a shared cache backend, costs one version read instead of a query.
+    A per-process backend can't tell this worker about other workers'
+    changes, so the session is queried on every call instead.
+    The returned instance is shared between requests; treat it as read-only.
+    """
+    from .models import Session
+    queryset = Session.objects.filter(is_active=True)
+    if school_id is not None:
+        queryset = queryset.filter(school_id=school_id)
+    if not CACHE_IS_SHARED:
+        return queryset.first()
     
-    cache_key = CACHE_KEYS['subjects_list']
-    data = cache.get(cache_key)
+    version = get_cache_version('sessions')
+    now = time.monotonic()
+    local = _active_sessions.get(school_id)
+    if local is not None and local[0] == version and local[1] > now:
+        return local[2]
     
-    if data is None:
-        subjects = Subject.objects.all()
-        data = SubjectSerializer(subjects, many=True).data
-        cache.set(cache_key, data, CACHE_TTL_LONG)
+    session = queryset.first()
+    _active_sessions[school_id] = (version, now + CACHE_TTL_SHORT, session)
+    return session
+
+
+def _build_session_locks():
+    from .models import Session
+    return {str(pk): locked for pk, locked in Session.objects.values_list('id', 'is_locked')}
+
+
+def is_session_locked(session_id):
+    """
+    Whether the session is locked, or None if it doesn't exist.
+    With a shared cache backend, reads the {session id: is_locked} map stored
+    under the current 'sessions' version; any Session save/delete bumps the
+    version, so all workers rebuild it. A per-process backend can't propagate
+    that bump, so the lock is read from the database instead.
+    """
+    if CACHE_IS_SHARED:
+        # Map keys are canonical str(pk); accept any spelling the DB would
+        try:
+            key = str(uuid.UUID(str(session_id)))
+        except ValueError:
+            return None
+        version = get_cache_version('sessions')
+        locks = cache.get_or_set(f"sessions:locks:v{version}", _build_session_locks, CACHE_TTL_SHORT)
+        return locks.get(key)
     
-    return data
+    from django.core.exceptions import ValidationError
+    from .models import Session
+    try:
+        return Session.objects.filter(id=session_id).values_list('is_locked', flat=True).first()
+    except ValidationError:
+        return None
 
 
 def invalidate_model_cache(model_name: str):
     """
     Invalidate cache for a specific model.
-    Handles both static keys (for helpers) and versioned keys (for ViewSets).
+    Bumps the prefix version, which covers both the get_cached_* helper keys
+    and every filtered/paginated variant cached by ViewSets with CacheMixin.
     """
     model_key = model_name.lower()
     
-    # 1. Invalidate static keys (used by get_cached_* helpers)
-    key_map = {
-        'session': CACHE_KEYS['sessions_list'],
-        'class': CACHE_KEYS['classes_list'],
-        'section': CACHE_KEYS['sections_list'],
-        'subject': CACHE_KEYS['subjects_list'],
-        'cocurricularsubject': CACHE_KEYS['cocurricular_subjects_list'],
-        'optionalsubject': CACHE_KEYS['optional_subjects_list'],
-        'teacher': CACHE_KEYS['teachers_list'],
-    }
-    cache_key = key_map.get(model_key)
-    if cache_key:
-        cache.delete(cache_key)
-        
-    # 2. Invalidate versioned keys (used by ViewSets with CacheMixin)
     prefix_map = {
         'session': 'sessions',
         'class': 'classes',
@@ -243,3 +570,7 @@ def invalidate_model_cache(model_name: str):
     prefix = prefix_map.get(model_key)
     if prefix:
         invalidate_cache_prefix(prefix)
+    if model_key in CLASS_CONFIG_MODELS:
+        invalidate_cache_prefix(CACHE_KEYS['class_config'])
+    if model_key in PENDING_FEES_MODELS:
+        invalidate_cache_prefix(CACHE_KEYS['pending_fees'])
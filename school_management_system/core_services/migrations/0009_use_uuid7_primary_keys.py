@@ -0,0 +1,144 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:21
+
+import core_services.uuid7
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_services', '0008_assessmentcategory_cocurricularmarksdistribution_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='admin',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='assessmentcategory',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='class',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='classcocurricularconfig',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='classmarksdistribution',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='classoptionalassignment',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='classoptionalconfig',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='classsubjectassignment',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='classteacher',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='cocurricularmarksdistribution',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='cocurricularsubject',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='cocurricularteacherassignment',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='coresubjectmarksdistribution',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='optionalmarksdistribution',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='optionalsubject',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='optionalteacherassignment',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='school',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='schoolconfig',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='section',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='session',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='studentenrollment',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='subject',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='teacher',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='teacherassignment',
+            name='id',
+            field=models.UUIDField(default=core_services.uuid7.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
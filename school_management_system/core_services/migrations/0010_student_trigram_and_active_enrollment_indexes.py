@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:21
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_services', '0009_use_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RemoveIndex(
+            model_name='student',
+            name='idx_stu_cls_sec',
+        ),
+        migrations.RemoveIndex(
+            model_name='studentenrollment',
+            name='idx_enroll_status',
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='idx_stu_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='studentenrollment',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['status'], name='idx_enroll_active'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+STUDENT_ID_SEQUENCE = 'students_student_id_seq'
+
+
+def create_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f"CREATE SEQUENCE IF NOT EXISTS {STUDENT_ID_SEQUENCE} START 100000")
+
+
+def drop_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f"DROP SEQUENCE IF EXISTS {STUDENT_ID_SEQUENCE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_services', '0010_student_trigram_and_active_enrollment_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_sequence, drop_sequence),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:24
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_services', '0011_student_id_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classmarksdistribution',
+            name='total_marks',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('first_summative_marks'), '+', models.F('first_formative_marks')), '+', models.F('second_summative_marks')), '+', models.F('second_formative_marks')), '+', models.F('third_summative_marks')), '+', models.F('third_formative_marks')), output_field=models.IntegerField()),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_services', '0012_classmarksdistribution_total_marks'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='teacherassignment',
+            name='idx_ta_cls_sec_session',
+        ),
+        migrations.RemoveIndex(
+            model_name='teacherassignment',
+            name='idx_ta_cls_sec_sub_sess',
+        ),
+        migrations.AddIndex(
+            model_name='teacherassignment',
+            index=models.Index(fields=['class_ref', 'section', 'session', 'subject'], name='idx_ta_cls_sec_sess_sub'),
+        ),
+    ]
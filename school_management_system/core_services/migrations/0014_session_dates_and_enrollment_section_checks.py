@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:26
+
+from django.db import migrations, models
+
+
+CREATE_ENROLLMENT_SECTION_TRIGGER = """
+CREATE OR REPLACE FUNCTION check_enrollment_section() RETURNS trigger AS $$
+BEGIN
+    IF (SELECT class_id FROM sections WHERE id = NEW.section_id) IS DISTINCT FROM NEW.class_id THEN
+        RAISE EXCEPTION 'Section must belong to the selected class'
+            USING ERRCODE = 'check_violation';
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_enrollment_section
+    BEFORE INSERT OR UPDATE OF section_id, class_id ON student_enrollments
+    FOR EACH ROW EXECUTE FUNCTION check_enrollment_section();
+"""
+
+DROP_ENROLLMENT_SECTION_TRIGGER = """
+DROP TRIGGER IF EXISTS trg_enrollment_section ON student_enrollments;
+DROP FUNCTION IF EXISTS check_enrollment_section();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(CREATE_ENROLLMENT_SECTION_TRIGGER)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(DROP_ENROLLMENT_SECTION_TRIGGER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_services', '0013_teacherassignment_merge_class_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='session',
+            constraint=models.CheckConstraint(condition=models.Q(('end_date__gt', models.F('start_date'))), name='session_dates_valid'),
+        ),
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_services', '0014_session_dates_and_enrollment_section_checks'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='classteacher',
+            name='session',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='class_teachers', to='core_services.session'),
+        ),
+        migrations.AlterField(
+            model_name='cocurricularteacherassignment',
+            name='session',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='cocurricular_teacher_assignments', to='core_services.session'),
+        ),
+        migrations.AlterField(
+            model_name='optionalteacherassignment',
+            name='session',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='optional_teacher_assignments', to='core_services.session'),
+        ),
+        migrations.AlterField(
+            model_name='studentenrollment',
+            name='session',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='enrollments', to='core_services.session'),
+        ),
+        migrations.AlterField(
+            model_name='teacherassignment',
+            name='session',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='teacher_assignments', to='core_services.session'),
+        ),
+    ]
@@ -7,16 +7,85 @@ System Philosophy:
 - Historical immutability and strong data integrity
 - Full auditability with session-based record management
 """
-import uuid
-from django.db import models
+import secrets
+import string
+from .uuid7 import uuid7
+from django.db import connection, models, transaction
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Now
+from django.contrib.auth.hashers import check_password as _check_password, make_password
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.core.exceptions import ValidationError
 
 
+class SelectRelatedQuerySet(models.QuerySet):
+    """
+    QuerySet for models with a SelectRelatedManager default manager.
+    only()/defer() drop the default joins on relations that are no longer
+    loaded, which Django would otherwise reject as deferred and traversed.
+    """
+    def _drop_default_joins(self, keep):
+        joins = self.query.select_related
+        defaults = getattr(self.model._meta.default_manager, 'related_fields', ())
+        if isinstance(joins, dict) and any(name in joins and not keep(name) for name in defaults):
+            self.query.select_related = {
+                name: nested for name, nested in joins.items()
+                if name not in defaults or keep(name)
+            } or False
+        return self
+    
+    def only(self, *fields):
+        loaded = {field.split(LOOKUP_SEP, 1)[0] for field in fields}
+        return super().only(*fields)._drop_default_joins(lambda name: name in loaded)
+    
+    def defer(self, *fields):
+        deferred = {field for field in fields if field is not None}
+        return super().defer(*fields)._drop_default_joins(lambda name: name not in deferred)
+
+
+class SelectRelatedManager(models.Manager.from_queryset(SelectRelatedQuerySet)):
+    """
+    Manager that joins `related_fields` by default.
+    Used for assignment/enrollment models whose __str__ and listings
+    dereference several FKs, which would otherwise be one query per row.
+    The join list is a class attribute so the reverse related managers
+    Django derives from this class (e.g. student.enrollments) inherit it.
+    """
+    related_fields = ()
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.related_fields:
+            queryset = queryset.select_related(*self.related_fields)
+        return queryset
+
+
+class StudentEnrollmentManager(SelectRelatedManager):
+    related_fields = ('student', 'class_ref', 'section', 'session')
+
+
+class ClassTeacherManager(SelectRelatedManager):
+    related_fields = ('teacher', 'class_ref', 'section', 'session')
+
+
+class TeacherAssignmentManager(SelectRelatedManager):
+    related_fields = ('teacher', 'class_ref', 'section', 'subject', 'session')
+
+
+class CocurricularTeacherAssignmentManager(SelectRelatedManager):
+    related_fields = ('teacher', 'class_ref', 'section', 'cocurricular_subject', 'session')
+
+
+class OptionalTeacherAssignmentManager(SelectRelatedManager):
+    related_fields = ('teacher', 'class_ref', 'section', 'optional_subject', 'session')
+
+
 class School(models.Model):
     """School/Tenant in the multi-tenant SaaS system."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     name = models.CharField(max_length=255)
     code = models.CharField(max_length=50, unique=True, help_text="Short unique identifier for the school")
     logo = models.ImageField(upload_to='school_logos/', null=True, blank=True)
@@ -30,7 +99,7 @@ class School(models.Model):
     website = models.URLField(blank=True)
     student_id_prefix = models.CharField(max_length=10, default='STU', help_text="Prefix for auto-generated student IDs")
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -45,7 +114,7 @@ class School(models.Model):
 
 class CustomUser(AbstractUser):
     """Extended User model for authentication."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     email = models.EmailField(unique=True)
     
     # User role field - 4 levels: site_admin, admin (school), teacher, student
@@ -94,11 +163,11 @@ class CustomUser(AbstractUser):
 
 class Admin(models.Model):
     """Admin profile linked to user. Each admin manages one school."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='admin_profile')
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='admins', null=True, blank=True)
     name = models.CharField(max_length=255)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'admins'
@@ -123,11 +192,11 @@ class Admin(models.Model):
 
 class Teacher(models.Model):
     """Teacher profile linked to user. Each teacher belongs to one school."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='teacher_profile')
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='teachers', null=True, blank=True)
     name = models.CharField(max_length=255)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'teachers'
@@ -150,6 +219,17 @@ class Teacher(models.Model):
             self.user.save()
 
 
+def _analyze_session_tables():
+    """
+    Refresh planner statistics after a session is locked: its rows just went
+    from hot to historical, shifting the distribution of session-keyed tables.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE student_enrollments, teacher_assignments")
+
+
 class Session(models.Model):
     """
     Academic session/year per school.
@@ -160,14 +240,14 @@ class Session(models.Model):
     - New session enrollment is created for promoted students
     - Historical data remains immutable
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='sessions', null=True, blank=True)
     name = models.CharField(max_length=100)
     start_date = models.DateField()
     end_date = models.DateField()
     is_active = models.BooleanField(default=False)
     is_locked = models.BooleanField(default=False, help_text="When locked, no academic/financial changes allowed")
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'sessions'
@@ -181,16 +261,75 @@ class Session(models.Model):
             ),
             models.Index(fields=['school', 'is_active'], name='idx_session_school_active'),
         ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end_date__gt=models.F('start_date')),
+                name='session_dates_valid'
+            ),
+        ]
     
     def clean(self):
         if self.end_date <= self.start_date:
             raise ValidationError("End date must be after start date")
     
+    @classmethod
+    def get_active_cached(cls, school=None):
+        """Get the active session from the per-process cache (see cache_utils)."""
+        from .cache_utils import get_active_session
+        return get_active_session(school.pk if school is not None else None)
+    
+    def archive_and_drop(self, batch_size=10000):
+        """
+        Permanently delete the session and everything recorded against it.
+        
+        Enrollments and teacher assignments PROTECT their session, so a plain
+        delete() refuses to cascade through them. Results, fees (with their
+        payments) and school configs still CASCADE, but would all be collected
+        in the final delete. Every dependent table is emptied first in
+        batches, each in its own short transaction, instead of one huge cascade.
+        """
+        from django.apps import apps
+        
+        dependents = [
+            ('result_management.StudentResult', 'session'),
+            ('result_management.StudentCocurricularResult', 'session'),
+            ('result_management.StudentOptionalResult', 'session'),
+            ('payments_management.Payment', 'student_fee__session'),
+            ('payments_management.PaymentReminder', 'student_fee__session'),
+            ('payments_management.StudentFee', 'session'),
+            ('payments_management.FeeStructure', 'session'),
+            ('core_services.SchoolConfig', 'session'),
+            ('core_services.StudentEnrollment', 'session'),
+            ('core_services.ClassTeacher', 'session'),
+            ('core_services.TeacherAssignment', 'session'),
+            ('core_services.CocurricularTeacherAssignment', 'session'),
+            ('core_services.OptionalTeacherAssignment', 'session'),
+        ]
+        for label, lookup in dependents:
+            model = apps.get_model(label)
+            queryset = model._base_manager.filter(**{lookup: self})
+            while True:
+                pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    break
+                with transaction.atomic():
+                    model._base_manager.filter(pk__in=pks).delete()
+        
+        self.delete()
+    
     def lock_session(self):
         """Lock the session preventing any further modifications"""
+        from .cache_utils import invalidate_model_cache
+        
+        with transaction.atomic():
+            # Single-statement UPDATE of just the two flags; .update() skips
+            # post_save, so the session caches are invalidated explicitly
+            Session.objects.filter(pk=self.pk).update(is_locked=True, is_active=False)
+            transaction.on_commit(lambda: invalidate_model_cache('session'))
+            transaction.on_commit(_analyze_session_tables)
+        
         self.is_locked = True
         self.is_active = False
-        self.save()
     
     def __str__(self):
         school_code = self.school.code if self.school else 'Global'
@@ -199,11 +338,11 @@ class Session(models.Model):
 
 class Class(models.Model):
     """School class/grade per school."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='classes', null=True, blank=True)
     name = models.CharField(max_length=100)
     level = models.IntegerField(default=0, help_text="Numeric level for ordering")
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'classes'
@@ -219,10 +358,10 @@ class Class(models.Model):
 
 class Section(models.Model):
     """Class section (e.g., A, B, C)."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     name = models.CharField(max_length=50)
     class_ref = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='sections', db_column='class_id')
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'sections'
@@ -237,12 +376,12 @@ class Section(models.Model):
 
 class Subject(models.Model):
     """Academic subject per school."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='subjects', null=True, blank=True)
     name = models.CharField(max_length=100)
     code = models.CharField(max_length=20)  # Unique per school, not globally
     full_marks = models.IntegerField(default=100)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'subjects'
@@ -255,11 +394,11 @@ class Subject(models.Model):
 
 class CocurricularSubject(models.Model):
     """Co-curricular activity subject per school."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='cocurricular_subjects', null=True, blank=True)
     name = models.CharField(max_length=100)
     code = models.CharField(max_length=20)  # Unique per school
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'cocurricular_subjects'
@@ -272,12 +411,12 @@ class CocurricularSubject(models.Model):
 
 class OptionalSubject(models.Model):
     """Optional subject per school."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='optional_subjects', null=True, blank=True)
     name = models.CharField(max_length=100)
     code = models.CharField(max_length=20)  # Unique per school
     default_full_marks = models.IntegerField(default=50)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'optional_subjects'
@@ -290,11 +429,11 @@ class OptionalSubject(models.Model):
 
 class ClassSubjectAssignment(models.Model):
     """Assignment of subjects to classes."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     class_ref = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='subject_assignments', db_column='class_id')
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='class_assignments')
     is_required = models.BooleanField(default=True)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'class_subject_assignments'
@@ -306,10 +445,10 @@ class ClassSubjectAssignment(models.Model):
 
 class ClassOptionalConfig(models.Model):
     """Configuration for optional subjects per class."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     class_ref = models.OneToOneField(Class, on_delete=models.CASCADE, related_name='optional_config', db_column='class_id')
     has_optional = models.BooleanField(default=False)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'class_optional_config'
@@ -320,12 +459,12 @@ class ClassOptionalConfig(models.Model):
 
 class ClassOptionalAssignment(models.Model):
     """Assignment of optional subjects to classes."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     class_ref = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='optional_assignments', db_column='class_id')
     optional_subject = models.ForeignKey(OptionalSubject, on_delete=models.CASCADE, related_name='class_assignments')
     full_marks = models.IntegerField(default=50)
     is_required = models.BooleanField(default=True)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'class_optional_assignments'
@@ -337,10 +476,10 @@ class ClassOptionalAssignment(models.Model):
 
 class ClassCocurricularConfig(models.Model):
     """Configuration for co-curricular activities per class."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     class_ref = models.OneToOneField(Class, on_delete=models.CASCADE, related_name='cocurricular_config', db_column='class_id')
     has_cocurricular = models.BooleanField(default=False)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     
     class Meta:
         db_table = 'class_cocurricular_config'
@@ -352,7 +491,7 @@ class ClassCocurricularConfig(models.Model):
 
 class ClassMarksDistribution(models.Model):
     """Marks distribution configuration per class."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     class_ref = models.OneToOneField(Class, on_delete=models.CASCADE, related_name='marks_distribution', db_column='class_id')
     first_summative_marks = models.IntegerField(default=40)
     first_formative_marks = models.IntegerField(default=10)
@@ -365,19 +504,26 @@ class ClassMarksDistribution(models.Model):
     unit_test_marks = models.IntegerField(default=40)
     formative_marks = models.IntegerField(default=10)
     final_term_marks = models.IntegerField(default=40)
-    created_at = models.DateTimeField(default=timezone.now)
+    # Stored generated column: computed by the database on write, read as a plain column
+    total_marks = models.GeneratedField(
+        expression=(
+            models.F('first_summative_marks') + models.F('first_formative_marks') +
+            models.F('second_summative_marks') + models.F('second_formative_marks') +
+            models.F('third_summative_marks') + models.F('third_formative_marks')
+        ),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'class_marks_distribution'
     
-    @property
-    def total_marks(self):
-        return (
-            self.first_summative_marks + self.first_formative_marks +
-            self.second_summative_marks + self.second_formative_marks +
-            self.third_summative_marks + self.third_formative_marks
-        )
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Defer the generated total so the next access reloads the value the database computed
+        self.__dict__.pop('total_marks', None)
     
     def __str__(self):
         return f"{self.class_ref.name} - Total: {self.total_marks}"
@@ -385,11 +531,11 @@ class ClassMarksDistribution(models.Model):
 
 class SchoolConfig(models.Model):
     """School configuration per class and session."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     class_ref = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='school_configs', db_column='class_id', null=True, blank=True)
     session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='school_configs', null=True, blank=True)
     total_school_days = models.IntegerField(default=200)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -404,6 +550,30 @@ class SchoolConfig(models.Model):
         return f"{class_name} - {session_name} - {self.total_school_days} days"
 
 
+# Postgres sequence backing the numeric suffix of auto-generated student IDs
+STUDENT_ID_SEQUENCE = 'students_student_id_seq'
+
+
+class StudentQuerySet(models.QuerySet):
+    def for_roster(self):
+        """Only the columns a class roster shows; skips the wide text and PII columns."""
+        return self.only('id', 'student_id', 'name', 'roll_no', 'class_ref_id', 'section_id', 'is_active')
+    
+    def for_detail(self):
+        """Everything except the password hash, which display paths never need."""
+        return self.defer('password_hash')
+    
+    def with_current_enrollment(self):
+        """
+        Prefetch each student's active-session enrollment in one query, so
+        get_current_enrollment() doesn't hit the database per student.
+        """
+        active_enrollments = StudentEnrollment.objects.filter(session__is_active=True)
+        return self.prefetch_related(
+            models.Prefetch('enrollments', queryset=active_enrollments, to_attr='_current_enrollments')
+        )
+
+
 class Student(models.Model):
     """
     Permanent Student Identity per school.
@@ -412,7 +582,7 @@ class Student(models.Model):
     This model stores the permanent student information.
     Session-specific data (class, section, roll number) is in StudentEnrollment.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='students', null=True, blank=True)
     student_id = models.CharField(max_length=50, help_text="Permanent unique student identifier per school")
     
@@ -452,9 +622,11 @@ class Student(models.Model):
     # Status
     is_active = models.BooleanField(default=True)
     
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = StudentQuerySet.as_manager()
+    
     class Meta:
         db_table = 'students'
         ordering = ['name']
@@ -462,21 +634,34 @@ class Student(models.Model):
         indexes = [
             models.Index(fields=['school', 'student_id'], name='idx_stu_school_student_id'),
             models.Index(fields=['session', 'class_ref', 'section'], name='idx_stu_sess_cls_sec'),
-            models.Index(fields=['class_ref', 'section'], name='idx_stu_cls_sec'),
             models.Index(fields=['name'], name='idx_stu_name'),
+            # Trigram index so icontains name searches can use an index
+            GinIndex(fields=['name'], name='idx_stu_name_trgm', opclasses=['gin_trgm_ops']),
             models.Index(fields=['class_ref', 'roll_no'], name='idx_stu_cls_roll'),
             models.Index(fields=['admission_session'], name='idx_stu_admission_sess'),
         ]
     
     def set_password(self, raw_password):
         """Hash and set the password."""
-        from django.contrib.auth.hashers import make_password
         self.password_hash = make_password(raw_password)
     
     def check_password(self, raw_password):
-        """Check the password against the stored hash."""
-        from django.contrib.auth.hashers import check_password
-        return check_password(raw_password, self.password_hash)
+        """
+        Check the password against the stored hash.
+        Hashes made by an older hasher (or with outdated parameters) are
+        upgraded to the preferred one in PASSWORD_HASHERS on success.
+        """
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self.save(update_fields=['password_hash'])
+        
+        # The DOB default is hashed lazily on the first login attempt,
+        # so bulk onboarding never pays for PBKDF2
+        if not self.password_hash and self.date_of_birth:
+            self.set_default_password()
+            Student.objects.filter(pk=self.pk).update(password_hash=self.password_hash)
+        
+        return _check_password(raw_password, self.password_hash, setter)
     
     def set_default_password(self):
         """Set default password as DOB in DDMMYYYY format."""
@@ -486,19 +671,35 @@ class Student(models.Model):
     
     def get_current_enrollment(self):
         """Get the current active session enrollment."""
+        prefetched = getattr(self, '_current_enrollments', None)
+        if prefetched is not None:
+            return prefetched[0] if prefetched else None
         return self.enrollments.filter(session__is_active=True).first()
     
+    @cached_property
+    def current_enrollment(self):
+        """
+        Current active enrollment, fetched once per instance.
+        Prefer this over the legacy class_ref/section/session/roll_no columns.
+        """
+        return self.get_current_enrollment()
+    
+    @cached_property
+    def enrollments_by_session(self):
+        """All of the student's enrollments keyed by session_id (one query, or none if prefetched)."""
+        return {enrollment.session_id: enrollment for enrollment in self.enrollments.all()}
+    
     def get_enrollment_for_session(self, session):
-        """Get enrollment for a specific session."""
-        return self.enrollments.filter(session=session).first()
+        """Get enrollment for a specific session (a Session or its id)."""
+        session_id = getattr(session, 'pk', session)
+        if ('enrollments_by_session' in self.__dict__
+                or 'enrollments' in getattr(self, '_prefetched_objects_cache', {})):
+            return self.enrollments_by_session.get(session_id)
+        return self.enrollments.filter(session_id=session_id).first()
     
     @staticmethod
     def generate_student_id(prefix='STU', year=None):
         """Generate a unique student ID with format: PREFIX_YEAR_XXXXXX"""
-        import secrets
-        import string
-        from django.utils import timezone
-        
         if year is None:
             year = timezone.now().year
         
@@ -508,21 +709,63 @@ class Student(models.Model):
         
         return f"{prefix}_{year}_{suffix}"
     
-    def save(self, *args, **kwargs):
-        # Auto-generate student_id if not provided
-        if not self.student_id:
+    @staticmethod
+    def _next_student_id_suffixes(count):
+        """
+        Reserve `count` suffixes from the student ID sequence in one query.
+        Falls back to random suffixes on databases without sequences.
+        """
+        if connection.vendor != 'postgresql':
+            return [Student.generate_student_id().rsplit('_', 1)[1] for _ in range(count)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                [STUDENT_ID_SEQUENCE, count]
+            )
+            return [f"{row[0]:06d}" for row in cursor.fetchall()]
+    
+    @classmethod
+    def assign_student_ids(cls, students):
+        """
+        Fill in student_id for every student in the batch that lacks one.
+        Lets bulk_create callers skip save() while keeping IDs collision-free.
+        """
+        pending = [student for student in students if not student.student_id]
+        if not pending:
+            return
+        
+        # Resolve schools/sessions that aren't already attached with one query each,
+        # instead of a lazy FK fetch per student
+        schools = School.objects.only('id', 'code', 'student_id_prefix').in_bulk({
+            s.school_id for s in pending
+            if s.school_id and not cls.school.is_cached(s)
+        })
+        sessions = Session.objects.only('id', 'start_date').in_bulk({
+            s.admission_session_id for s in pending
+            if s.admission_session_id and not cls.admission_session.is_cached(s)
+        })
+        
+        suffixes = cls._next_student_id_suffixes(len(pending))
+        current_year = timezone.now().year
+        for student, suffix in zip(pending, suffixes):
+            school = student.school if cls.school.is_cached(student) else schools.get(student.school_id)
             # Use school defined prefix if available, else school code, else 'STU'
-            if self.school and self.school.student_id_prefix:
-                prefix = self.school.student_id_prefix
+            if school and school.student_id_prefix:
+                prefix = school.student_id_prefix
             else:
-                prefix = self.school.code if self.school else 'STU'
+                prefix = school.code if school else 'STU'
             
-            year = self.admission_session.start_date.year if self.admission_session else timezone.now().year
-            self.student_id = self.generate_student_id(prefix=prefix, year=year)
-        
-        # Set default password if not set and DOB is available
-        if not self.password_hash and self.date_of_birth:
-            self.set_default_password()
+            if cls.admission_session.is_cached(student):
+                session = student.admission_session
+            else:
+                session = sessions.get(student.admission_session_id)
+            year = session.start_date.year if session else current_year
+            student.student_id = f"{prefix}_{year}_{suffix}"
+    
+    def save(self, *args, **kwargs):
+        # Auto-generate student_id if not provided
+        if not self.student_id:
+            Student.assign_student_ids([self])
         
         super().save(*args, **kwargs)
     
@@ -538,9 +781,9 @@ class StudentEnrollment(models.Model):
     This tracks their class, section, roll number, and status for that session.
     Historical enrollments remain immutable for audit purposes.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='enrollments')
-    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='enrollments')
+    session = models.ForeignKey(Session, on_delete=models.PROTECT, related_name='enrollments')
     class_ref = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='enrollments', db_column='class_id')
     section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='enrollments')
     roll_no = models.CharField(max_length=50)
@@ -564,29 +807,38 @@ class StudentEnrollment(models.Model):
     promotion_date = models.DateField(null=True, blank=True)
     remarks = models.TextField(blank=True)
     
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = StudentEnrollmentManager()
+    # Plain manager for bulk writes and counts that don't need the joins
+    objects_raw = models.Manager()
+    
     class Meta:
+        # Not partitioned by session: Postgres requires the partition key in every
+        # unique constraint, which rules out the UUID primary key and the
+        # promoted_to self-reference. Active-session reads are served by the
+        # session-leading composite index and the partial active-status index.
         db_table = 'student_enrollments'
         unique_together = ['student', 'session']
         ordering = ['-session__start_date', 'roll_no']
         indexes = [
             models.Index(fields=['session', 'class_ref', 'section'], name='idx_enroll_sess_cls_sec'),
             models.Index(fields=['student', 'session'], name='idx_enroll_stu_sess'),
-            models.Index(fields=['status'], name='idx_enroll_status'),
+            # Partial index: queries almost always filter on active enrollments
+            models.Index(
+                fields=['status'],
+                name='idx_enroll_active',
+                condition=models.Q(status='active')
+            ),
         ]
     
     def clean(self):
-        # Validate section belongs to class
-        if self.section and self.class_ref:
+        # Validate section belongs to class. The database enforces the same rule
+        # with a trigger (see migration 0014); this only gives forms a friendly error.
+        if self.section_id and self.class_ref_id:
             if self.section.class_ref_id != self.class_ref_id:
                 raise ValidationError("Section must belong to the selected class")
-        
-        # Prevent modification of locked sessions
-        if self.session and self.session.is_locked and self.pk:
-            # Only allow status changes for locked sessions
-            pass
     
     def promote_to_next_class(self, new_class, new_section, new_session, new_roll_no):
         """Promote student to next class/session."""
@@ -607,17 +859,84 @@ class StudentEnrollment(models.Model):
         self.status = 'promoted'
         self.promoted_to = new_enrollment
         self.promotion_date = timezone.now().date()
-        self.save()
+        self.save(update_fields=['status', 'promoted_to', 'promotion_date', 'updated_at'])
         
         # Update student's current class info
         self.student.class_ref = new_class
         self.student.section = new_section
         self.student.session = new_session
         self.student.roll_no = new_roll_no
-        self.student.save()
+        self.student.save(update_fields=['class_ref', 'section', 'session', 'roll_no', 'updated_at'])
         
         return new_enrollment
     
+    @classmethod
+    def bulk_promote(cls, promotions, batch_size=1000):
+        """
+        Promote many enrollments at once.
+        
+        `promotions` is an iterable of dicts with keys enrollment, new_class,
+        new_section, new_session and new_roll_no. Issues one INSERT for the new
+        enrollments and one UPDATE each for the old enrollments and students,
+        instead of three statements per student.
+        """
+        from .cache_utils import invalidate_model_cache
+        
+        promotions = list(promotions)
+        if not promotions:
+            return []
+        
+        now = timezone.now()
+        today = now.date()
+        new_enrollments = []
+        old_enrollments = []
+        students = []
+        
+        for promotion in promotions:
+            enrollment = promotion['enrollment']
+            if enrollment.status != 'active':
+                raise ValidationError("Only active students can be promoted")
+            
+            new_enrollment = cls(
+                student=enrollment.student,
+                session=promotion['new_session'],
+                class_ref=promotion['new_class'],
+                section=promotion['new_section'],
+                roll_no=promotion['new_roll_no'],
+                status='active'
+            )
+            new_enrollments.append(new_enrollment)
+            
+            enrollment.status = 'promoted'
+            enrollment.promoted_to = new_enrollment
+            enrollment.promotion_date = today
+            enrollment.updated_at = now
+            old_enrollments.append(enrollment)
+            
+            student = enrollment.student
+            student.class_ref = promotion['new_class']
+            student.section = promotion['new_section']
+            student.session = promotion['new_session']
+            student.roll_no = promotion['new_roll_no']
+            student.updated_at = now
+            students.append(student)
+        
+        cls.objects_raw.bulk_create(new_enrollments, batch_size=batch_size)
+        cls.objects_raw.bulk_update(
+            old_enrollments,
+            ['status', 'promoted_to', 'promotion_date', 'updated_at'],
+            batch_size=batch_size
+        )
+        Student.objects.bulk_update(
+            students,
+            ['class_ref', 'section', 'session', 'roll_no', 'updated_at'],
+            batch_size=batch_size
+        )
+        # bulk_update skips post_save; rosters moved, so drop cached pending-fee lists
+        transaction.on_commit(lambda: invalidate_model_cache('student'))
+        
+        return new_enrollments
+    
     def retain_in_same_class(self, new_session, new_roll_no=None):
         """Retain student in the same class for next session."""
         new_enrollment = StudentEnrollment.objects.create(
@@ -630,7 +949,7 @@ class StudentEnrollment(models.Model):
         )
         
         self.status = 'retained'
-        self.save()
+        self.save(update_fields=['status', 'updated_at'])
         
         return new_enrollment
     
@@ -638,10 +957,10 @@ class StudentEnrollment(models.Model):
         """Mark student as transferred out."""
         self.status = 'transferred'
         self.remarks = remarks
-        self.save()
+        self.save(update_fields=['status', 'remarks', 'updated_at'])
         
         self.student.is_active = False
-        self.student.save()
+        self.student.save(update_fields=['is_active', 'updated_at'])
     
     def __str__(self):
         return f"{self.student.name} - {self.class_ref.name} {self.section.name} ({self.session.name})"
@@ -654,16 +973,19 @@ class ClassTeacher(models.Model):
     Designates a teacher as the class teacher for a specific class/section/session.
     Class teachers can generate marksheets for their class.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='class_teacher_assignments')
     class_ref = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='class_teachers', db_column='class_id')
     section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='class_teachers')
-    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='class_teachers')
+    session = models.ForeignKey(Session, on_delete=models.PROTECT, related_name='class_teachers')
     is_active = models.BooleanField(default=True)
     
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ClassTeacherManager()
+    objects_raw = models.Manager()
+    
     class Meta:
         db_table = 'class_teachers'
         unique_together = ['class_ref', 'section', 'session']
@@ -683,23 +1005,26 @@ class TeacherAssignment(models.Model):
     Authorization Rule:
     Only the assigned subject teacher may enter marks for that subject.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='assignments')
     class_ref = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='teacher_assignments', db_column='class_id')
     section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='teacher_assignments')
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='teacher_assignments')
-    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='teacher_assignments')
+    session = models.ForeignKey(Session, on_delete=models.PROTECT, related_name='teacher_assignments')
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TeacherAssignmentManager()
+    objects_raw = models.Manager()
+    
     class Meta:
         db_table = 'teacher_assignments'
         unique_together = ['teacher', 'class_ref', 'section', 'subject', 'session']
         indexes = [
             models.Index(fields=['teacher', 'session'], name='idx_ta_teacher_session'),
-            models.Index(fields=['class_ref', 'section', 'session'], name='idx_ta_cls_sec_session'),
-            models.Index(fields=['class_ref', 'section', 'subject', 'session'], name='idx_ta_cls_sec_sub_sess'),
+            # Session before subject so class/section/session lookups use the index prefix
+            models.Index(fields=['class_ref', 'section', 'session', 'subject'], name='idx_ta_cls_sec_sess_sub'),
         ]
     
     def __str__(self):
@@ -708,16 +1033,19 @@ class TeacherAssignment(models.Model):
 
 class CocurricularTeacherAssignment(models.Model):
     """Assignment of teachers to cocurricular subjects for a class/section."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='cocurricular_assignments')
     class_ref = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='cocurricular_teacher_assignments', db_column='class_id')
     section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='cocurricular_teacher_assignments')
     cocurricular_subject = models.ForeignKey(CocurricularSubject, on_delete=models.CASCADE, related_name='teacher_assignments')
-    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='cocurricular_teacher_assignments')
+    session = models.ForeignKey(Session, on_delete=models.PROTECT, related_name='cocurricular_teacher_assignments')
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CocurricularTeacherAssignmentManager()
+    objects_raw = models.Manager()
+    
     class Meta:
         db_table = 'cocurricular_teacher_assignments'
         unique_together = ['class_ref', 'section', 'cocurricular_subject', 'session']
@@ -731,16 +1059,19 @@ class CocurricularTeacherAssignment(models.Model):
 
 class OptionalTeacherAssignment(models.Model):
     """Assignment of teachers to optional subjects for a class/section."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='optional_assignments')
     class_ref = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='optional_teacher_assignments', db_column='class_id')
     section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='optional_teacher_assignments')
     optional_subject = models.ForeignKey(OptionalSubject, on_delete=models.CASCADE, related_name='teacher_assignments')
-    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='optional_teacher_assignments')
+    session = models.ForeignKey(Session, on_delete=models.PROTECT, related_name='optional_teacher_assignments')
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = OptionalTeacherAssignmentManager()
+    objects_raw = models.Manager()
+    
     class Meta:
         db_table = 'optional_teacher_assignments'
         unique_together = ['class_ref', 'section', 'optional_subject', 'session']
@@ -2,9 +2,9 @@
 Additional models for dynamic marks distribution system.
 This file extends core_services/models.py with new models.
 """
-import uuid
+from .uuid7 import uuid7
 from django.db import models
-from django.utils import timezone
+from django.db.models.functions import Now
 from django.core.exceptions import ValidationError
 
 
@@ -21,14 +21,14 @@ class AssessmentCategory(models.Model):
         ('other', 'Other'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     school = models.ForeignKey('School', on_delete=models.CASCADE, related_name='assessment_categories')
     name = models.CharField(max_length=100, help_text="e.g., 'Unit Test 1', 'Mid-Term Exam'")
     code = models.CharField(max_length=50, help_text="e.g., 'UT1', 'MT', 'FINAL'")
     category_type = models.CharField(max_length=20, choices=CATEGORY_TYPE_CHOICES, default='summative')
     display_order = models.IntegerField(default=0, help_text="Order in which this appears in UI")
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -49,11 +49,11 @@ class CoreSubjectMarksDistribution(models.Model):
     Defines marks for core subjects at class level.
     Each class can have different marks for each assessment category.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     class_ref = models.ForeignKey('Class', on_delete=models.CASCADE, related_name='core_marks_distributions', db_column='class_id')
     assessment_category = models.ForeignKey(AssessmentCategory, on_delete=models.CASCADE, related_name='core_distributions')
     full_marks = models.IntegerField(help_text="Full marks for this assessment")
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -76,12 +76,12 @@ class CocurricularMarksDistribution(models.Model):
     Defines marks for cocurricular subjects at class level.
     Each cocurricular subject can have different marks for each assessment category.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     class_ref = models.ForeignKey('Class', on_delete=models.CASCADE, related_name='cocurricular_marks_distributions', db_column='class_id')
     cocurricular_subject = models.ForeignKey('CocurricularSubject', on_delete=models.CASCADE, related_name='marks_distributions')
     assessment_category = models.ForeignKey(AssessmentCategory, on_delete=models.CASCADE, related_name='cocurricular_distributions')
     full_marks = models.IntegerField(help_text="Full marks for this assessment")
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -104,12 +104,12 @@ class OptionalMarksDistribution(models.Model):
     Defines marks for optional subjects at class level.
     Each optional subject can have different marks for each assessment category.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     class_ref = models.ForeignKey('Class', on_delete=models.CASCADE, related_name='optional_marks_distributions', db_column='class_id')
     optional_subject = models.ForeignKey('OptionalSubject', on_delete=models.CASCADE, related_name='marks_distributions')
     assessment_category = models.ForeignKey(AssessmentCategory, on_delete=models.CASCADE, related_name='optional_distributions')
     full_marks = models.IntegerField(help_text="Full marks for this assessment")
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(db_default=Now())
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
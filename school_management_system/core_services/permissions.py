@@ -11,6 +11,14 @@ All permissions are enforced at API level using DRF permissions.
 """
 from rest_framework import permissions
 from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Exists, OuterRef
+from payments_management.models import StudentFee
+from .cache_utils import (
+    CACHE_IS_SHARED, CACHE_KEYS, CACHE_TTL_SHORT, get_cache_version, get_or_build_json,
+    is_session_locked
+)
+from .models import ClassTeacher, Session, Student, TeacherAssignment
 
 
 class IsAdminUser(permissions.BasePermission):
@@ -103,26 +111,16 @@ class CanEnterMarks(permissions.BasePermission):
         except Exception:
             return False
         
-        # Check teacher assignment for the subject
-        from .models import TeacherAssignment
-        
         # obj could be a StudentResult or request data
         if hasattr(obj, 'student'):
             student = obj.student
-            subject = obj.subject
-            session = obj.session
+            combo = (student.class_ref_id, student.section_id, obj.subject_id, obj.session_id)
         else:
             # Try to get from request data
             return True  # Let view handle specific validation
         
-        return TeacherAssignment.objects.filter(
-            teacher=teacher,
-            class_ref=student.class_ref,
-            section=student.section,
-            subject=subject,
-            session=session,
-            is_active=True
-        ).exists()
+        # Check teacher assignment for the subject via the request-scoped cache
+        return get_permission_cache(request).has_teacher_assignment(teacher, combo)
 
 
 class CanGenerateMarksheet(permissions.BasePermission):
@@ -201,12 +199,7 @@ class SessionNotLocked(permissions.BasePermission):
         if not session_id:
             return True
         
-        from .models import Session
-        try:
-            session = Session.objects.get(id=session_id)
-            return not session.is_locked
-        except Session.DoesNotExist:
-            return True
+        return not is_session_locked(session_id)
 
 
 class CanAccessStudentData(permissions.BasePermission):
@@ -227,27 +220,134 @@ class CanAccessStudentData(permissions.BasePermission):
         return user.role in ['admin', 'teacher']
 
 
+def get_request_session(request, session_id):
+    """
+    Load a Session (just id, is_locked and start_date) once per request.
+    Views and validators share the instance instead of each running their
+    own lookup. Returns None if the session does not exist.
+    """
+    sessions = request.__dict__.setdefault('_session_cache', {})
+    key = str(session_id)
+    if key not in sessions:
+        try:
+            sessions[key] = Session.objects.only('id', 'is_locked', 'start_date').filter(id=session_id).first()
+        except ValidationError:
+            sessions[key] = None
+    return sessions[key]
+
+
+class PermissionCache:
+    """
+    Request-scoped memo for per-object marks checks.
+    
+    Loads the teacher's whole assignment set for a session once and tests
+    membership, instead of one lookup per object.
+    """
+    
+    def __init__(self):
+        self._assignment_sets = {}
+    
+    def teacher_assignment_set(self, teacher, session_id):
+        """
+        All (class_ref_id, section_id, subject_id) the teacher teaches in a session,
+        loaded with one query the first time the request asks about that session.
+        """
+        key = (teacher.id, str(session_id))
+        if key not in self._assignment_sets:
+            self._assignment_sets[key] = frozenset(
+                tuple(str(part) for part in row)
+                for row in TeacherAssignment.objects_raw.filter(
+                    teacher_id=teacher.id,
+                    session_id=session_id,
+                    is_active=True
+                ).values_list('class_ref_id', 'section_id', 'subject_id')
+            )
+        return self._assignment_sets[key]
+    
+    def has_teacher_assignment(self, teacher, combo):
+        """Membership check of a (class_ref_id, section_id, subject_id, session_id) combo."""
+        class_ref_id, section_id, subject_id, session_id = (str(part) for part in combo)
+        return (class_ref_id, section_id, subject_id) in self.teacher_assignment_set(teacher, session_id)
+
+
+def get_permission_cache(request):
+    """Return the PermissionCache attached to this request, creating it on first use."""
+    perm_cache = getattr(request, '_perm_cache', None)
+    if perm_cache is None:
+        perm_cache = PermissionCache()
+        request._perm_cache = perm_cache
+    return perm_cache
+
+
+def bulk_check_teacher_subject_assignments(teacher, combos):
+    """
+    Check many (class_ref_id, section_id, subject_id, session_id) combos for a teacher.
+    Returns the set of authorized combos (with ids as strings).
+    
+    Cached answers are read with one get_many; misses are resolved with a
+    single query and written back with one set_many.
+    """
+    combos = {tuple(str(part) for part in combo) for combo in combos}
+    if not combos:
+        return set()
+    
+    keys = {combo: f"teacher_assignment:{teacher.id}:{':'.join(combo)}" for combo in combos}
+    cached = cache.get_many(list(keys.values()))
+    authorized = {combo for combo, key in keys.items() if cached.get(key)}
+    misses = [combo for combo, key in keys.items() if key not in cached]
+    
+    if misses:
+        assigned = {
+            tuple(str(part) for part in row)
+            for row in TeacherAssignment.objects_raw.filter(
+                teacher_id=teacher.id,
+                session_id__in={combo[3] for combo in misses},
+                is_active=True
+            ).values_list('class_ref_id', 'section_id', 'subject_id', 'session_id')
+        }
+        cache.set_many({keys[combo]: combo in assigned for combo in misses}, 300)  # Cache for 5 minutes
+        authorized.update(combo for combo in misses if combo in assigned)
+    
+    return authorized
+
+
+def bulk_check_class_teacher(teacher, combos):
+    """
+    Check many (class_ref_id, section_id, session_id) combos for a class teacher.
+    Returns the set of authorized combos (with ids as strings), batched like
+    bulk_check_teacher_subject_assignments.
+    """
+    combos = {tuple(str(part) for part in combo) for combo in combos}
+    if not combos:
+        return set()
+    
+    keys = {combo: f"class_teacher:{teacher.id}:{':'.join(combo)}" for combo in combos}
+    cached = cache.get_many(list(keys.values()))
+    authorized = {combo for combo, key in keys.items() if cached.get(key)}
+    misses = [combo for combo, key in keys.items() if key not in cached]
+    
+    if misses:
+        assigned = {
+            tuple(str(part) for part in row)
+            for row in ClassTeacher.objects_raw.filter(
+                teacher_id=teacher.id,
+                session_id__in={combo[2] for combo in misses},
+                is_active=True
+            ).values_list('class_ref_id', 'section_id', 'session_id')
+        }
+        cache.set_many({keys[combo]: combo in assigned for combo in misses}, 300)  # Cache for 5 minutes
+        authorized.update(combo for combo in misses if combo in assigned)
+    
+    return authorized
+
+
 def check_teacher_subject_assignment(teacher, class_ref, section, subject, session):
     """
     Utility function to check if a teacher is assigned to teach a subject.
     Uses caching for performance.
     """
-    cache_key = f"teacher_assignment:{teacher.id}:{class_ref.id}:{section.id}:{subject.id}:{session.id}"
-    result = cache.get(cache_key)
-    
-    if result is None:
-        from .models import TeacherAssignment
-        result = TeacherAssignment.objects.filter(
-            teacher=teacher,
-            class_ref=class_ref,
-            section=section,
-            subject=subject,
-            session=session,
-            is_active=True
-        ).exists()
-        cache.set(cache_key, result, 300)  # Cache for 5 minutes
-    
-    return result
+    combo = (class_ref.id, section.id, subject.id, session.id)
+    return bool(bulk_check_teacher_subject_assignments(teacher, [combo]))
 
 
 def check_class_teacher(teacher, class_ref, section, session):
@@ -255,21 +355,8 @@ def check_class_teacher(teacher, class_ref, section, session):
     Utility function to check if a teacher is the class teacher.
     Uses caching for performance.
     """
-    cache_key = f"class_teacher:{teacher.id}:{class_ref.id}:{section.id}:{session.id}"
-    result = cache.get(cache_key)
-    
-    if result is None:
-        from .models import ClassTeacher
-        result = ClassTeacher.objects.filter(
-            teacher=teacher,
-            class_ref=class_ref,
-            section=section,
-            session=session,
-            is_active=True
-        ).exists()
-        cache.set(cache_key, result, 300)  # Cache for 5 minutes
-    
-    return result
+    combo = (class_ref.id, section.id, session.id)
+    return bool(bulk_check_class_teacher(teacher, [combo]))
 
 
 def check_student_fees_cleared(student, session):
@@ -279,8 +366,6 @@ def check_student_fees_cleared(student, session):
     Critical Business Rule:
     If student fees are not cleared → Result and Marksheet generation must be blocked
     """
-    from payments_management.models import StudentFee
-    
     # Check for any pending fees
     pending_fees = StudentFee.objects.filter(
         student=student,
@@ -291,6 +376,38 @@ def check_student_fees_cleared(student, session):
     return not pending_fees
 
 
+def get_students_with_pending_fees(class_ref, section, session):
+    """
+    List the active students of a class/section with uncleared fees for the session.
+    Runs a single query (an EXISTS subquery per roster row) instead of one
+    fee query per student, and only projects the three columns the response needs.
+    With a shared cache backend, the list is cached per class/section/session
+    until a Student or StudentFee changes. A per-process backend can't see
+    other workers' version bumps, and a stale empty list would let a marksheet
+    through for unpaid fees, so there it is always queried.
+    """
+    def build():
+        pending_fees = StudentFee.objects.filter(
+            student=OuterRef('pk'),
+            session=session,
+            status__in=['pending', 'partial', 'overdue']
+        )
+        students = Student.objects.filter(
+            class_ref=class_ref,
+            section=section,
+            session=session,
+            is_active=True
+        ).filter(Exists(pending_fees)).values('id', 'student_id', 'name')
+        return list(students)
+    
+    if not CACHE_IS_SHARED:
+        return build()
+    
+    prefix = CACHE_KEYS['pending_fees']
+    cache_key = f"{prefix}:v{get_cache_version(prefix)}:{class_ref.pk}:{section.pk}:{session.pk}"
+    return get_or_build_json(cache_key, build, CACHE_TTL_SHORT)
+
+
 def validate_marks_entry_permission(user, student, subject, session):
     """
     Validate if user can enter marks for a student's subject.
@@ -320,6 +437,37 @@ def validate_marks_entry_permission(user, student, subject, session):
     return True, None
 
 
+def validate_bulk_marks_entry_permission(user, entries):
+    """
+    Validate marks entry for many rows at once.
+    `entries` is an iterable of (student, subject_id, session); students only
+    need class_ref_id and section_id loaded. All assignment checks share one
+    cache round trip and at most one query.
+    Returns (is_allowed, error_message)
+    """
+    if user.role == 'admin':
+        return True, None
+    
+    if user.role != 'teacher':
+        return False, "Only teachers and admins can enter marks."
+    
+    try:
+        teacher = user.teacher_profile
+    except Exception:
+        return False, "Teacher profile not found."
+    
+    combos = set()
+    for student, subject_id, session in entries:
+        if session.is_locked:
+            return False, "This session is locked and cannot be modified."
+        combos.add((str(student.class_ref_id), str(student.section_id), str(subject_id), str(session.id)))
+    
+    if combos - bulk_check_teacher_subject_assignments(teacher, combos):
+        return False, "You are not assigned to teach this subject for this class."
+    
+    return True, None
+
+
 def validate_marksheet_generation_permission(user, class_ref, section, session, check_fees=True):
     """
     Validate if user can generate marksheet for a class.
@@ -328,25 +476,7 @@ def validate_marksheet_generation_permission(user, class_ref, section, session,
     if user.role == 'admin':
         if check_fees:
             # Still check for pending fees even for admin
-            from payments_management.models import StudentFee
-            from .models import Student
-            
-            students = Student.objects.filter(
-                class_ref=class_ref,
-                section=section,
-                session=session,
-                is_active=True
-            )
-            
-            students_with_pending = []
-            for student in students:
-                if not check_student_fees_cleared(student, session):
-                    students_with_pending.append({
-                        'id': str(student.id),
-                        'student_id': student.student_id,
-                        'name': student.name
-                    })
-            
+            students_with_pending = get_students_with_pending_fees(class_ref, section, session)
             if students_with_pending:
                 return False, "Some students have pending fees.", students_with_pending
         
@@ -366,25 +496,7 @@ def validate_marksheet_generation_permission(user, class_ref, section, session,
     
     if check_fees:
         # Check for pending fees
-        from payments_management.models import StudentFee
-        from .models import Student
-        
-        students = Student.objects.filter(
-            class_ref=class_ref,
-            section=section,
-            session=session,
-            is_active=True
-        )
-        
-        students_with_pending = []
-        for student in students:
-            if not check_student_fees_cleared(student, session):
-                students_with_pending.append({
-                    'id': str(student.id),
-                    'student_id': student.student_id,
-                    'name': student.name
-                })
-        
+        students_with_pending = get_students_with_pending_fees(class_ref, section, session)
         if students_with_pending:
             return False, "Some students have pending fees.", students_with_pending
     
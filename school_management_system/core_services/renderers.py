@@ -0,0 +1,21 @@
+"""
+Custom DRF renderers.
+"""
+from rest_framework import renderers
+import orjson
+
+
+class ORJSONRenderer(renderers.BaseRenderer):
+    """
+    JSON renderer backed by orjson.
+    Drop-in replacement for DRF's JSONRenderer with much faster serialization.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+    options = orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, option=self.options, default=str)
@@ -1,10 +1,17 @@
 """
 Serializers for Core Services API.
 """
+import functools
+import secrets
+import uuid
+from collections.abc import Mapping
+
 from rest_framework import serializers
-from django.contrib.auth import authenticate
+from rest_framework.fields import SkipField, empty, get_error_detail
+from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.auth.password_validation import validate_password
-from django.db import transaction
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
 from .models import (
     CustomUser, Admin, Teacher, Session, Class, Section,
     Subject, CocurricularSubject, OptionalSubject, ClassSubjectAssignment,
@@ -15,6 +22,76 @@ from .models import (
 )
 
 
+# Shared formatter so the hand-written to_representation() methods below emit
+# the same ISO-8601 strings (in TIME_ZONE) that DateTimeField would.
+_datetime_field = serializers.DateTimeField()
+
+
+def _format_datetime(value):
+    return _datetime_field.to_representation(value) if value else None
+
+
+def _context_ids(rows, key):
+    """Collect the valid UUIDs under `key` in raw request rows; bad ones are left to field validation."""
+    ids = set()
+    for row in rows:
+        try:
+            ids.add(uuid.UUID(str(row.get(key))))
+        except ValueError:
+            pass
+    return ids
+
+
+def _reject_duplicate_rows(items, source, field_name):
+    """
+    Reject a validated batch that references the same `source` object twice.
+    A single INSERT ... ON CONFLICT DO UPDATE cannot touch one row twice.
+    """
+    seen = set()
+    for item in items:
+        pk = item[source].pk
+        if pk in seen:
+            raise serializers.ValidationError({field_name: [f"Duplicate {field_name} {pk} in batch."]})
+        seen.add(pk)
+
+
+def _context_get(context, key, model, pk):
+    """
+    Look `pk` up in the `{pk: obj}` map a parent serializer or view placed in
+    context[key], falling back to a query when no map was provided.
+    """
+    objects = context.get(key)
+    if objects is None:
+        return model.objects.get(id=pk)
+    try:
+        return objects[pk]
+    except KeyError:
+        raise model.DoesNotExist(f"{model.__name__} {pk} not found") from None
+
+
+class ContextPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that first looks the pk up in the `{pk: obj}` map a
+    parent list serializer placed in context[context_key], so a batch of rows
+    costs one in_bulk instead of one query per row.
+    """
+    
+    def __init__(self, context_key=None, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+    
+    def to_internal_value(self, data):
+        objects = self.context.get(self.context_key)
+        if objects is not None:
+            try:
+                obj = objects.get(self.get_queryset().model._meta.pk.to_python(data))
+            except (DjangoValidationError, TypeError):
+                obj = None
+            if obj is not None:
+                return obj
+        return super().to_internal_value(data)
+
+
 class SchoolSerializer(serializers.ModelSerializer):
     """Serializer for School details."""
     
@@ -42,6 +119,14 @@ class AdminSerializer(serializers.ModelSerializer):
         model = Admin
         fields = ['id', 'email', 'name', 'created_at']
         read_only_fields = ['id', 'created_at']
+    
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'email': instance.user.email,
+            'name': instance.name,
+            'created_at': _format_datetime(instance.created_at),
+        }
 
 
 class TeacherSerializer(serializers.ModelSerializer):
@@ -52,6 +137,14 @@ class TeacherSerializer(serializers.ModelSerializer):
         model = Teacher
         fields = ['id', 'email', 'name', 'created_at']
         read_only_fields = ['id', 'created_at']
+    
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'email': instance.user.email,
+            'name': instance.name,
+            'created_at': _format_datetime(instance.created_at),
+        }
 
 
 class TeacherCreateSerializer(serializers.Serializer):
@@ -60,30 +153,39 @@ class TeacherCreateSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True, validators=[validate_password])
     name = serializers.CharField(max_length=255)
     
-    def validate_email(self, value):
-        if CustomUser.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
-    
     def create(self, validated_data):
         # Get school from request context
         request = self.context.get('request')
         school = request.user.school if request and hasattr(request.user, 'school') else None
         
-        user = CustomUser.objects.create_user(
-            email=validated_data['email'],
-            username=validated_data['email'],
-            password=validated_data['password'],
+        # Hash before opening the transaction so PBKDF2 doesn't extend it
+        email = CustomUser.objects.normalize_email(validated_data['email'])
+        user = CustomUser(
+            email=email,
+            username=CustomUser.normalize_username(email),
+            password=make_password(validated_data['password']),
             role='teacher',
             school=school
         )
-        teacher = Teacher.objects.create(
-            user=user,
-            name=validated_data['name']
-        )
+        # The unique index on email is the duplicate check; no SELECT beforehand
+        try:
+            with transaction.atomic():
+                user.save()
+                teacher = Teacher.objects.create(
+                    user=user,
+                    name=validated_data['name']
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({'email': "A user with this email already exists."})
         return teacher
 
 
+@functools.cache
+def _dummy_password_hash():
+    """Hash checked for unknown logins so misses cost the same as a wrong password."""
+    return make_password(secrets.token_urlsafe(32))
+
+
 class LoginSerializer(serializers.Serializer):
     """Serializer for user login."""
     email = serializers.EmailField()
@@ -94,11 +196,15 @@ class LoginSerializer(serializers.Serializer):
         password = data.get('password')
         
         if email and password:
-            user = authenticate(username=email, password=password)
-            if not user:
+            # Same checks as ModelBackend, minus the backend loop: one SELECT,
+            # one hash verification, inactive accounts rejected as invalid
+            try:
+                user = CustomUser.objects.get(email=email)
+            except CustomUser.DoesNotExist:
+                check_password(password, _dummy_password_hash())
+                raise serializers.ValidationError("Invalid login credentials.")
+            if not user.check_password(password) or not user.is_active:
                 raise serializers.ValidationError("Invalid login credentials.")
-            if not user.is_active:
-                raise serializers.ValidationError("User account is disabled.")
             data['user'] = user
         else:
             raise serializers.ValidationError("Must include 'email' and 'password'.")
@@ -107,11 +213,22 @@ class LoginSerializer(serializers.Serializer):
 
 
 class SessionSerializer(serializers.ModelSerializer):
-    """Serializer for academic sessions."""
+    """Serializer for academic sessions with lock status."""
     class Meta:
         model = Session
-        fields = ['id', 'name', 'start_date', 'end_date', 'is_active', 'created_at']
+        fields = ['id', 'name', 'start_date', 'end_date', 'is_active', 'is_locked', 'created_at']
         read_only_fields = ['id', 'created_at']
+    
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'name': instance.name,
+            'start_date': instance.start_date.isoformat(),
+            'end_date': instance.end_date.isoformat(),
+            'is_active': instance.is_active,
+            'is_locked': instance.is_locked,
+            'created_at': _format_datetime(instance.created_at),
+        }
 
 
 class ClassSerializer(serializers.ModelSerializer):
@@ -120,11 +237,19 @@ class ClassSerializer(serializers.ModelSerializer):
         model = Class
         fields = ['id', 'name', 'level', 'created_at']
         read_only_fields = ['id', 'created_at']
+    
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'name': instance.name,
+            'level': instance.level,
+            'created_at': _format_datetime(instance.created_at),
+        }
 
 
 class SectionSerializer(serializers.ModelSerializer):
     """Serializer for sections."""
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True)
     class_name = serializers.CharField(source='class_ref.name', read_only=True)
     
     class Meta:
@@ -132,6 +257,15 @@ class SectionSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'class_id', 'class_name', 'created_at']
         read_only_fields = ['id', 'created_at']
     
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'name': instance.name,
+            'class_id': str(instance.class_ref_id),
+            'class_name': instance.class_ref.name,
+            'created_at': _format_datetime(instance.created_at),
+        }
+    
     def create(self, validated_data):
         class_id = self.context.get('class_id') or self.initial_data.get('class_id')
         if class_id:
@@ -141,17 +275,16 @@ class SectionSerializer(serializers.ModelSerializer):
 
 class SectionCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating sections with class_id."""
-    class_id = serializers.UUIDField(write_only=True)
+    class_id = serializers.PrimaryKeyRelatedField(
+        queryset=Class.objects.only('id'),
+        source='class_ref',
+        write_only=True
+    )
     
     class Meta:
         model = Section
         fields = ['id', 'name', 'class_id', 'created_at']
         read_only_fields = ['id', 'created_at']
-    
-    def create(self, validated_data):
-        class_id = validated_data.pop('class_id')
-        validated_data['class_ref'] = Class.objects.get(id=class_id)
-        return super().create(validated_data)
 
 
 class SubjectSerializer(serializers.ModelSerializer):
@@ -160,6 +293,15 @@ class SubjectSerializer(serializers.ModelSerializer):
         model = Subject
         fields = ['id', 'name', 'code', 'full_marks', 'created_at']
         read_only_fields = ['id', 'created_at']
+    
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'name': instance.name,
+            'code': instance.code,
+            'full_marks': instance.full_marks,
+            'created_at': _format_datetime(instance.created_at),
+        }
 
 
 class CocurricularSubjectSerializer(serializers.ModelSerializer):
@@ -168,6 +310,14 @@ class CocurricularSubjectSerializer(serializers.ModelSerializer):
         model = CocurricularSubject
         fields = ['id', 'name', 'code', 'created_at']
         read_only_fields = ['id', 'created_at']
+    
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'name': instance.name,
+            'code': instance.code,
+            'created_at': _format_datetime(instance.created_at),
+        }
 
 
 class OptionalSubjectSerializer(serializers.ModelSerializer):
@@ -176,43 +326,104 @@ class OptionalSubjectSerializer(serializers.ModelSerializer):
         model = OptionalSubject
         fields = ['id', 'name', 'code', 'default_full_marks', 'created_at']
         read_only_fields = ['id', 'created_at']
+    
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'name': instance.name,
+            'code': instance.code,
+            'default_full_marks': instance.default_full_marks,
+            'created_at': _format_datetime(instance.created_at),
+        }
+
+
+class ClassSubjectAssignmentBulkSerializer(serializers.ListSerializer):
+    """Upserts a class's subject assignments with one INSERT ... ON CONFLICT DO UPDATE."""
+    
+    def to_internal_value(self, data):
+        # Resolve every subject in the batch at once; each row's subject_id reads this map
+        if isinstance(data, list):
+            rows = [row for row in data if isinstance(row, Mapping)]
+            self.context['subjects'] = self.child.fields['subject_id'].get_queryset().in_bulk(
+                _context_ids(rows, 'subject_id')
+            )
+        validated = super().to_internal_value(data)
+        _reject_duplicate_rows(validated, 'subject', 'subject_id')
+        return validated
+    
+    def create(self, validated_data):
+        class_id = self.context.get('class_id')
+        assignments = [
+            ClassSubjectAssignment(
+                class_ref_id=class_id,
+                subject=item['subject'],
+                is_required=item.get('is_required', True)
+            )
+            for item in validated_data
+        ]
+        ClassSubjectAssignment.objects.bulk_create(
+            assignments,
+            update_conflicts=True,
+            unique_fields=['class_ref', 'subject'],
+            update_fields=['is_required']
+        )
+        # Django only reads the pk back for objects that had none, so rows that
+        # hit the conflict still carry the uuid7 generated here; load the real ids
+        ids = dict(ClassSubjectAssignment.objects.filter(
+            class_ref_id=class_id,
+            subject_id__in=[assignment.subject_id for assignment in assignments]
+        ).values_list('subject_id', 'id'))
+        for assignment in assignments:
+            assignment.id = ids[assignment.subject_id]
+        return assignments
 
 
 class ClassSubjectAssignmentSerializer(serializers.ModelSerializer):
     """Serializer for class-subject assignments."""
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True)
     subject = SubjectSerializer(read_only=True)
-    subject_id = serializers.UUIDField(write_only=True)
+    subject_id = ContextPrimaryKeyRelatedField(
+        queryset=Subject.objects.all(),
+        source='subject',
+        write_only=True,
+        context_key='subjects'
+    )
     
     class Meta:
         model = ClassSubjectAssignment
         fields = ['id', 'class_id', 'subject', 'subject_id', 'is_required', 'created_at']
         read_only_fields = ['id', 'created_at']
+        list_serializer_class = ClassSubjectAssignmentBulkSerializer
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the nested subject and load only the columns this serializer renders."""
+        return queryset.select_related('subject').only(
+            'id', 'class_ref', 'is_required', 'created_at',
+            'subject__id', 'subject__name', 'subject__code', 'subject__full_marks', 'subject__created_at'
+        )
     
     def create(self, validated_data):
-        subject_id = validated_data.pop('subject_id')
         class_id = self.context.get('class_id') or self.initial_data.get('class_id')
-        subject = Subject.objects.get(id=subject_id)
-        class_ref = Class.objects.get(id=class_id) if class_id else None
         
         # Use get_or_create to handle duplicates gracefully
         instance, created = ClassSubjectAssignment.objects.get_or_create(
-            class_ref=class_ref,
-            subject=subject,
+            class_ref_id=class_id or None,
+            subject=validated_data['subject'],
             defaults={'is_required': validated_data.get('is_required', True)}
         )
         
         # If it already exists, update is_required if provided
         if not created and 'is_required' in validated_data:
             instance.is_required = validated_data['is_required']
-            instance.save()
+            instance.save(update_fields=['is_required'])
         
         return instance
 
 
 class ClassOptionalConfigSerializer(serializers.ModelSerializer):
     """Serializer for class optional configuration."""
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True)
     
     class Meta:
         model = ClassOptionalConfig
@@ -232,40 +443,99 @@ class ClassOptionalConfigSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class ClassOptionalAssignmentBulkSerializer(serializers.ListSerializer):
+    """Upserts a class's optional subject assignments with one INSERT ... ON CONFLICT DO UPDATE."""
+    
+    def to_internal_value(self, data):
+        # Resolve every optional subject in the batch at once
+        if isinstance(data, list):
+            rows = [row for row in data if isinstance(row, Mapping)]
+            self.context['optional_subjects'] = self.child.fields['optional_subject_id'].get_queryset().in_bulk(
+                _context_ids(rows, 'optional_subject_id')
+            )
+        validated = super().to_internal_value(data)
+        _reject_duplicate_rows(validated, 'optional_subject', 'optional_subject_id')
+        return validated
+    
+    def create(self, validated_data):
+        class_id = self.context.get('class_id')
+        assignments = [
+            ClassOptionalAssignment(
+                class_ref_id=class_id,
+                optional_subject=item['optional_subject'],
+                full_marks=item.get('full_marks', 100),
+                is_required=item.get('is_required', True)
+            )
+            for item in validated_data
+        ]
+        ClassOptionalAssignment.objects.bulk_create(
+            assignments,
+            update_conflicts=True,
+            unique_fields=['class_ref', 'optional_subject'],
+            update_fields=['full_marks', 'is_required']
+        )
+        # Rows that hit the conflict keep their client-side uuid7; load the real ids
+        ids = dict(ClassOptionalAssignment.objects.filter(
+            class_ref_id=class_id,
+            optional_subject_id__in=[assignment.optional_subject_id for assignment in assignments]
+        ).values_list('optional_subject_id', 'id'))
+        for assignment in assignments:
+            assignment.id = ids[assignment.optional_subject_id]
+        return assignments
+
+
 class ClassOptionalAssignmentSerializer(serializers.ModelSerializer):
     """Serializer for class optional subject assignments."""
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True)
     optional_subject = OptionalSubjectSerializer(read_only=True)
-    optional_subject_id = serializers.UUIDField(write_only=True)
+    optional_subject_id = ContextPrimaryKeyRelatedField(
+        queryset=OptionalSubject.objects.all(),
+        source='optional_subject',
+        write_only=True,
+        context_key='optional_subjects'
+    )
     
     class Meta:
         model = ClassOptionalAssignment
         fields = ['id', 'class_id', 'optional_subject', 'optional_subject_id', 'full_marks', 'is_required', 'created_at']
         read_only_fields = ['id', 'created_at']
+        list_serializer_class = ClassOptionalAssignmentBulkSerializer
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the nested optional subject and load only the columns this serializer renders."""
+        return queryset.select_related('optional_subject').only(
+            'id', 'class_ref', 'full_marks', 'is_required', 'created_at',
+            'optional_subject__id', 'optional_subject__name', 'optional_subject__code',
+            'optional_subject__default_full_marks', 'optional_subject__created_at'
+        )
     
     def create(self, validated_data):
-        optional_subject_id = validated_data.pop('optional_subject_id')
         class_id = self.context.get('class_id') or self.initial_data.get('class_id')
-        optional_subject = OptionalSubject.objects.get(id=optional_subject_id)
-        class_ref = Class.objects.get(id=class_id) if class_id else None
+        full_marks = validated_data.get('full_marks')
+        is_required = validated_data.get('is_required')
         
         # Use get_or_create to handle duplicates gracefully
         instance, created = ClassOptionalAssignment.objects.get_or_create(
-            class_ref=class_ref,
-            optional_subject=optional_subject,
+            class_ref_id=class_id or None,
+            optional_subject=validated_data['optional_subject'],
             defaults={
-                'full_marks': validated_data.get('full_marks', 100),
-                'is_required': validated_data.get('is_required', True)
+                'full_marks': 100 if full_marks is None else full_marks,
+                'is_required': True if is_required is None else is_required
             }
         )
         
-        # If it already exists, update fields if provided
+        # If it already exists, update only the fields that were provided
         if not created:
-            if 'full_marks' in validated_data:
-                instance.full_marks = validated_data['full_marks']
-            if 'is_required' in validated_data:
-                instance.is_required = validated_data['is_required']
-            instance.save()
+            update_fields = []
+            if full_marks is not None:
+                instance.full_marks = full_marks
+                update_fields.append('full_marks')
+            if is_required is not None:
+                instance.is_required = is_required
+                update_fields.append('is_required')
+            if update_fields:
+                instance.save(update_fields=update_fields)
         
         return instance
 
@@ -273,7 +543,7 @@ class ClassOptionalAssignmentSerializer(serializers.ModelSerializer):
 class ClassCocurricularConfigSerializer(serializers.ModelSerializer):
     """Serializer for class co-curricular configuration."""
     class_id = serializers.PrimaryKeyRelatedField(
-        queryset=Class.objects.all(),
+        queryset=Class.objects.only('id'),
         source='class_ref'
     )
     
@@ -285,7 +555,7 @@ class ClassCocurricularConfigSerializer(serializers.ModelSerializer):
 
 class ClassMarksDistributionSerializer(serializers.ModelSerializer):
     """Serializer for class marks distribution."""
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True)
     total_marks = serializers.IntegerField(read_only=True)
     
     class Meta:
@@ -304,8 +574,8 @@ class ClassMarksDistributionSerializer(serializers.ModelSerializer):
 
 class SchoolConfigSerializer(serializers.ModelSerializer):
     """Serializer for school configuration."""
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True, allow_null=True)
-    session_id = serializers.UUIDField(source='session.id', read_only=True, allow_null=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True, allow_null=True)
+    session_id = serializers.UUIDField(read_only=True, allow_null=True)
     
     class Meta:
         model = SchoolConfig
@@ -315,9 +585,9 @@ class SchoolConfigSerializer(serializers.ModelSerializer):
 
 class StudentSerializer(serializers.ModelSerializer):
     """Serializer for students."""
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True, allow_null=True)
-    section_id = serializers.UUIDField(source='section.id', read_only=True, allow_null=True)
-    session_id = serializers.UUIDField(source='session.id', read_only=True, allow_null=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True, allow_null=True)
+    section_id = serializers.UUIDField(read_only=True, allow_null=True)
+    session_id = serializers.UUIDField(read_only=True, allow_null=True)
     class_name = serializers.CharField(source='class_ref.name', read_only=True, allow_null=True)
     section_name = serializers.CharField(source='section.name', read_only=True, allow_null=True)
     session_name = serializers.CharField(source='session.name', read_only=True, allow_null=True)
@@ -333,9 +603,63 @@ class StudentSerializer(serializers.ModelSerializer):
             'is_active', 'created_at'
         ]
         read_only_fields = ['id', 'student_id', 'created_at']
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the FKs behind the *_name fields so a list costs one query."""
+        return queryset.select_related('class_ref', 'section', 'session')
 
 
 
+class StudentBulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer for bulk student imports.
+    
+    Import rows usually carry a handful of the ~20 writable fields, so each row
+    only runs the fields it actually sends (plus required ones) instead of the
+    child's whole field set. Overrides ListSerializer.run_child_validation,
+    which DRF added in 3.15.
+    """
+    
+    @functools.cached_property
+    def _row_fields(self):
+        child = self.child
+        return [
+            (field, getattr(child, 'validate_' + field.field_name, None))
+            for field in child.fields.values()
+            if not field.read_only
+        ]
+    
+    def run_child_validation(self, data):
+        if not isinstance(data, Mapping):
+            return super().run_child_validation(data)
+        
+        attrs = {}
+        errors = {}
+        for field, validate_method in self._row_fields:
+            if field.field_name not in data and not field.required and field.default is empty:
+                continue
+            try:
+                value = field.run_validation(field.get_value(data))
+                if validate_method is not None:
+                    value = validate_method(value)
+            except serializers.ValidationError as exc:
+                errors[field.field_name] = exc.detail
+            except DjangoValidationError as exc:
+                errors[field.field_name] = get_error_detail(exc)
+            except SkipField:
+                pass
+            else:
+                # Student's writable fields all have flat (non-dotted) sources
+                attrs[field.source] = value
+        
+        if errors:
+            raise serializers.ValidationError(errors)
+        
+        self.child.run_validators(attrs)
+        return self.child.validate(attrs)
+
+
 class StudentCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating students."""
     class_id = serializers.UUIDField(write_only=True, required=False, allow_null=True)
@@ -352,6 +676,7 @@ class StudentCreateSerializer(serializers.ModelSerializer):
             'class_id', 'section_id', 'session_id', 'password', 'is_active', 'created_at'
         ]
         read_only_fields = ['id', 'student_id', 'created_at']
+        list_serializer_class = StudentBulkListSerializer
 
     def validate(self, data):
         roll_no = data.get('roll_no')
@@ -362,9 +687,15 @@ class StudentCreateSerializer(serializers.ModelSerializer):
         # Check for update case where fields might not be in data but on instance
         if self.instance:
             roll_no = roll_no or self.instance.roll_no
-            class_id = class_id or (self.instance.class_ref.id if self.instance.class_ref else None)
-            section_id = section_id or (self.instance.section.id if self.instance.section else None)
-            session_id = session_id or (self.instance.session.id if self.instance.session else None)
+            class_id = class_id or self.instance.class_ref_id
+            section_id = section_id or self.instance.section_id
+            session_id = session_id or self.instance.session_id
+
+        # Rows of a bulk import are checked together by BulkStudentCreateSerializer
+        if isinstance(self.parent, serializers.ListSerializer):
+            return data
+
+        self._validate_school_refs(data)
 
         if roll_no and class_id and section_id and session_id:
             queryset = Student.objects.filter(
@@ -383,30 +714,50 @@ class StudentCreateSerializer(serializers.ModelSerializer):
         
         return data
     
+    def _validate_school_refs(self, data):
+        """
+        Check that the class/section/session ids sent exist and belong to the
+        requesting user's school (any school for users without one).
+        """
+        request = self.context.get('request')
+        school = getattr(getattr(request, 'user', None), 'school', None)
+        errors = {}
+        for field_name, queryset, school_lookup in (
+            ('class_id', Class.objects.all(), 'school'),
+            ('section_id', Section.objects.all(), 'class_ref__school'),
+            ('session_id', Session.objects.all(), 'school'),
+        ):
+            pk = data.get(field_name)
+            if not pk:
+                continue
+            if school is not None:
+                queryset = queryset.filter(**{school_lookup: school})
+            if not queryset.filter(pk=pk).exists():
+                errors[field_name] = [f'Invalid pk "{pk}" - object does not exist.']
+        if errors:
+            raise serializers.ValidationError(errors)
+    
     def create(self, validated_data):
         class_id = validated_data.pop('class_id', None)
         section_id = validated_data.pop('section_id', None)
         session_id = validated_data.pop('session_id', None)
         password = validated_data.pop('password', None)
         
+        # Assign FK ids directly; validate() has checked them on the single-object
+        # path, and the bulk path resolves them with in_bulk
         if class_id:
-            validated_data['class_ref'] = Class.objects.get(id=class_id)
+            validated_data['class_ref_id'] = class_id
         if section_id:
-            validated_data['section'] = Section.objects.get(id=section_id)
+            validated_data['section_id'] = section_id
         if session_id:
-            validated_data['session'] = Session.objects.get(id=session_id)
+            validated_data['session_id'] = session_id
         
-        student = super().create(validated_data)
-        
-        # Set password (custom or default DOB)
+        # Hash a custom password up front so the student is written once;
+        # the DOB default is hashed on first login
         if password:
-            student.set_password(password)
-            student.save()
-        elif student.date_of_birth and not student.password_hash:
-            student.set_default_password()
-            student.save()
+            validated_data['password_hash'] = make_password(password)
         
-        return student
+        return super().create(validated_data)
     
     def update(self, instance, validated_data):
         class_id = validated_data.pop('class_id', None)
@@ -415,11 +766,11 @@ class StudentCreateSerializer(serializers.ModelSerializer):
         password = validated_data.pop('password', None)
         
         if class_id:
-            instance.class_ref = Class.objects.get(id=class_id)
+            instance.class_ref_id = class_id
         if section_id:
-            instance.section = Section.objects.get(id=section_id)
+            instance.section_id = section_id
         if session_id:
-            instance.session = Session.objects.get(id=session_id)
+            instance.session_id = session_id
         
         # Update password if provided
         if password:
@@ -428,21 +779,32 @@ class StudentCreateSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+# Nested serializers for StudentDetailSerializer, built once per process.
+# Kept outside the class body so the serializer metaclass doesn't turn them
+# into declared fields that get deep-copied for every serializer instance.
+_STUDENT_DETAIL_NESTED = (
+    ('class_info', 'class_ref', ClassSerializer()),
+    ('section_info', 'section', SectionSerializer()),
+    ('session_info', 'session', SessionSerializer()),
+)
+
+
 class StudentDetailSerializer(StudentSerializer):
     """Detailed student serializer with related objects."""
-    class_info = ClassSerializer(source='class_ref', read_only=True)
-    section_info = SectionSerializer(source='section', read_only=True)
-    session_info = SessionSerializer(source='session', read_only=True)
     
-    class Meta(StudentSerializer.Meta):
-        fields = StudentSerializer.Meta.fields + ['class_info', 'section_info', 'session_info']
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for key, attr, serializer in _STUDENT_DETAIL_NESTED:
+            related = getattr(instance, attr)
+            data[key] = serializer.to_representation(related) if related is not None else None
+        return data
 
 
 class BulkStudentCreateSerializer(serializers.Serializer):
     """Serializer for bulk student creation."""
     students = StudentCreateSerializer(many=True)
     
-    @transaction.atomic
+    @transaction.atomic(savepoint=False)
     def create(self, validated_data):
         students_data = validated_data.get('students', [])
         if not students_data:
@@ -452,98 +814,80 @@ class BulkStudentCreateSerializer(serializers.Serializer):
         user = request.user if request else None
         school = user.school if user and hasattr(user, 'school') else None
         
-        # Check for duplicates within the batch
+        # Single pass: in-batch duplicate check and the ids to prefetch
+        class_ids, section_ids, session_ids, roll_nos = set(), set(), set(), set()
         batch_keys = set()
-        for i, student in enumerate(students_data):
-            # Key: session_id|class_id|section_id|roll_no
-            key = f"{student.get('session_id')}|{student.get('class_id')}|{student.get('section_id')}|{student.get('roll_no')}"
+        for i, student_data in enumerate(students_data):
+            roll = student_data.get('roll_no')
+            class_id = student_data.get('class_id')
+            section_id = student_data.get('section_id')
+            session_id = student_data.get('session_id')
+            
+            key = (session_id, class_id, section_id, roll)
             if key in batch_keys:
                 raise serializers.ValidationError(
-                    f"Duplicate student in batch at row {i+1}: Roll no {student.get('roll_no')} already exists in the list for this class."
+                    f"Duplicate student in batch at row {i+1}: Roll no {roll} already exists in the list for this class."
                 )
             batch_keys.add(key)
-
-        # Collect all unique IDs to prefetch
-        class_ids = set()
-        section_ids = set()
-        session_ids = set()
-        
-        for student_data in students_data:
-            if 'class_id' in student_data and student_data['class_id']:
-                class_ids.add(student_data['class_id'])
-            if 'section_id' in student_data and student_data['section_id']:
-                section_ids.add(student_data['section_id'])
-            if 'session_id' in student_data and student_data['session_id']:
-                session_ids.add(student_data['session_id'])
+            
+            if class_id:
+                class_ids.add(class_id)
+            if section_id:
+                section_ids.add(section_id)
+            if session_id:
+                session_ids.add(session_id)
+            if roll:
+                roll_nos.add(roll)
         
         # Prefetch all related objects in bulk
-        classes_map = {c.id: c for c in Class.objects.filter(id__in=class_ids)} if class_ids else {}
-        sections_map = {s.id: s for s in Section.objects.filter(id__in=section_ids)} if section_ids else {}
-        sessions_map = {s.id: s for s in Session.objects.filter(id__in=session_ids)} if session_ids else {}
+        classes_map = Class.objects.in_bulk(class_ids)
+        sections_map = Section.objects.in_bulk(section_ids)
+        sessions_map = Session.objects.in_bulk(session_ids)
         
-        # Check against DB for existing students
-        for student_data in students_data:
-            roll = student_data.get('roll_no')
-            c_id = student_data.get('class_id')
-            s_id = student_data.get('section_id')
-            sess_id = student_data.get('session_id')
-            
-            if roll and c_id and s_id and sess_id:
-                 if Student.objects.filter(
-                    class_ref_id=c_id, 
-                    section_id=s_id, 
-                    session_id=sess_id, 
-                    roll_no=roll).exists():
-                     raise serializers.ValidationError(
-                        f"Student with Roll no {roll} already exists in target class/section."
+        # Check every row against existing students with one query
+        if roll_nos and class_ids and section_ids and session_ids:
+            existing = set(Student.objects.filter(
+                class_ref_id__in=class_ids,
+                section_id__in=section_ids,
+                session_id__in=session_ids,
+                roll_no__in=roll_nos
+            ).values_list('session_id', 'class_ref_id', 'section_id', 'roll_no'))
+            for student_data in students_data:
+                key = (
+                    student_data.get('session_id'), student_data.get('class_id'),
+                    student_data.get('section_id'), student_data.get('roll_no')
+                )
+                if key in existing:
+                    raise serializers.ValidationError(
+                        f"Student with Roll no {key[3]} already exists in target class/section."
                     )
         
-        # Prepare student objects for bulk creation
+        # Prepare student objects for bulk creation, keeping every submitted field
         student_objects = []
-        from django.utils import timezone
-        
         for student_data in students_data:
             class_id = student_data.pop('class_id', None)
             section_id = student_data.pop('section_id', None)
             session_id = student_data.pop('session_id', None)
-            
-            session = sessions_map.get(session_id) if session_id else None
+            password = student_data.pop('password', None)
+            session = sessions_map.get(session_id)
             
             student = Student(
-                roll_no=student_data.get('roll_no'),
-                name=student_data.get('name'),
-                date_of_birth=student_data.get('date_of_birth'),
-                father_name=student_data.get('father_name', ''),
-                mother_name=student_data.get('mother_name', ''),
-                guardian_name=student_data.get('guardian_name', ''),
-                phone=student_data.get('phone', ''),
-                class_ref=classes_map.get(class_id) if class_id else None,
-                section=sections_map.get(section_id) if section_id else None,
+                **student_data,
+                class_ref=classes_map.get(class_id),
+                section=sections_map.get(section_id),
                 session=session,
-                admission_session=session, # Set admission session
+                admission_session=session,  # Set admission session
                 school=school
             )
-            
-            # Generate ID
-            # Use school defined prefix if available, else school code, else 'STU'
-            if school and school.student_id_prefix:
-                prefix = school.student_id_prefix
-            else:
-                prefix = school.code if school else 'STU'
-            
-            year = session.start_date.year if session else timezone.now().year
-            student.student_id = Student.generate_student_id(prefix=prefix, year=year)
-            
-            # Set default password if DOB available
-            if student.date_of_birth:
-                student.set_default_password()
-                
+            if password:
+                student.password_hash = make_password(password)
             student_objects.append(student)
         
-        # Bulk create all students in a single query
-        created_students = Student.objects.bulk_create(student_objects)
+        # Reserve all student IDs with a single sequence query
+        Student.assign_student_ids(student_objects)
         
-        return created_students
+        # Bulk create in batches so huge imports don't become one giant INSERT
+        return Student.objects.bulk_create(student_objects, batch_size=1000)
 
 
 class StudentLoginSerializer(serializers.Serializer):
@@ -559,15 +903,24 @@ class StudentLoginSerializer(serializers.Serializer):
             raise serializers.ValidationError("Must include 'student_id' and 'password'.")
         
         try:
+            # Load just what check_password() and the StudentSerializer
+            # payload in the login response read. Disabled accounts are
+            # filtered out here and fail exactly like unknown IDs.
             student = Student.objects.select_related(
                 'class_ref', 'section', 'session'
-            ).get(student_id=student_id)
+            ).only(
+                'id', 'student_id', 'roll_no', 'name', 'date_of_birth',
+                'father_name', 'mother_name', 'guardian_name', 'guardian_relation',
+                'phone', 'alternate_phone', 'email', 'profile_pic', 'address',
+                'password_hash', 'is_active', 'created_at',
+                'class_ref__id', 'class_ref__name',
+                'section__id', 'section__name',
+                'session__id', 'session__name'
+            ).get(student_id=student_id, is_active=True)
         except Student.DoesNotExist:
+            check_password(password, _dummy_password_hash())
             raise serializers.ValidationError("Invalid student credentials.")
         
-        if not student.is_active:
-            raise serializers.ValidationError("Student account is disabled.")
-        
         if not student.check_password(password):
             raise serializers.ValidationError("Invalid student credentials.")
         
@@ -577,15 +930,15 @@ class StudentLoginSerializer(serializers.Serializer):
 
 class TeacherAssignmentSerializer(serializers.ModelSerializer):
     """Serializer for teacher assignments."""
-    teacher_id = serializers.UUIDField(source='teacher.id', read_only=True)
+    teacher_id = serializers.UUIDField(read_only=True)
     teacher_name = serializers.CharField(source='teacher.name', read_only=True)
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True)
     class_name = serializers.CharField(source='class_ref.name', read_only=True)
-    section_id = serializers.UUIDField(source='section.id', read_only=True)
+    section_id = serializers.UUIDField(read_only=True)
     section_name = serializers.CharField(source='section.name', read_only=True)
-    subject_id = serializers.UUIDField(source='subject.id', read_only=True)
+    subject_id = serializers.UUIDField(read_only=True)
     subject_name = serializers.CharField(source='subject.name', read_only=True)
-    session_id = serializers.UUIDField(source='session.id', read_only=True)
+    session_id = serializers.UUIDField(read_only=True)
     session_name = serializers.CharField(source='session.name', read_only=True)
     
     class Meta:
@@ -597,59 +950,135 @@ class TeacherAssignmentSerializer(serializers.ModelSerializer):
             'is_active', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the five FKs and load only the columns this serializer renders."""
+        return queryset.select_related(
+            'teacher', 'class_ref', 'section', 'subject', 'session'
+        ).only(
+            'id', 'is_active', 'created_at',
+            'teacher__name', 'class_ref__name', 'section__name', 'subject__name', 'session__name'
+        )
+    
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'teacher_id': str(instance.teacher_id),
+            'teacher_name': instance.teacher.name,
+            'class_id': str(instance.class_ref_id),
+            'class_name': instance.class_ref.name,
+            'section_id': str(instance.section_id),
+            'section_name': instance.section.name,
+            'subject_id': str(instance.subject_id),
+            'subject_name': instance.subject.name,
+            'session_id': str(instance.session_id),
+            'session_name': instance.session.name,
+            'is_active': instance.is_active,
+            'created_at': _format_datetime(instance.created_at),
+        }
 
 
 class TeacherAssignmentCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating teacher assignments."""
-    teacher_id = serializers.UUIDField(write_only=True)
-    class_id = serializers.UUIDField(write_only=True)
-    section_id = serializers.UUIDField(write_only=True)
-    subject_id = serializers.UUIDField(write_only=True)
-    session_id = serializers.UUIDField(write_only=True)
+    teacher_id = serializers.PrimaryKeyRelatedField(queryset=Teacher.objects.all(), source='teacher', write_only=True)
+    class_id = serializers.PrimaryKeyRelatedField(queryset=Class.objects.only('id'), source='class_ref', write_only=True)
+    section_id = serializers.PrimaryKeyRelatedField(queryset=Section.objects.all(), source='section', write_only=True)
+    subject_id = serializers.PrimaryKeyRelatedField(queryset=Subject.objects.all(), source='subject', write_only=True)
+    session_id = serializers.PrimaryKeyRelatedField(queryset=Session.objects.all(), source='session', write_only=True)
     
     class Meta:
         model = TeacherAssignment
         fields = ['id', 'teacher_id', 'class_id', 'section_id', 'subject_id', 'session_id', 'is_active', 'created_at']
         read_only_fields = ['id', 'created_at']
+
+
+class TeacherAssignmentRowSerializer(serializers.Serializer):
+    """One row of a bulk teacher assignment request; ids are resolved in bulk by the parent."""
+    teacher_id = serializers.UUIDField()
+    class_id = serializers.UUIDField()
+    section_id = serializers.UUIDField()
+    subject_id = serializers.UUIDField()
+    session_id = serializers.UUIDField()
+    is_active = serializers.BooleanField(required=False, default=True)
+
+
+class BulkTeacherAssignmentCreateSerializer(serializers.Serializer):
+    """Serializer for bulk teacher assignment creation."""
+    assignments = TeacherAssignmentRowSerializer(many=True)
     
-    def create(self, validated_data):
-        teacher_id = validated_data.pop('teacher_id')
-        class_id = validated_data.pop('class_id')
-        section_id = validated_data.pop('section_id')
-        subject_id = validated_data.pop('subject_id')
-        session_id = validated_data.pop('session_id')
+    def validate_assignments(self, rows):
+        if not rows:
+            return rows
         
-        validated_data['teacher'] = Teacher.objects.get(id=teacher_id)
-        validated_data['class_ref'] = Class.objects.get(id=class_id)
-        validated_data['section'] = Section.objects.get(id=section_id)
-        validated_data['subject'] = Subject.objects.get(id=subject_id)
-        validated_data['session'] = Session.objects.get(id=session_id)
+        # One in_bulk per related model instead of five lookups per row
+        lookups = (
+            ('teacher_id', Teacher), ('class_id', Class), ('section_id', Section),
+            ('subject_id', Subject), ('session_id', Session)
+        )
+        maps = {}
+        for key, model in lookups:
+            ids = {row[key] for row in rows}
+            maps[key] = model.objects.in_bulk(ids)
+            missing = ids - maps[key].keys()
+            if missing:
+                raise serializers.ValidationError(
+                    f"Unknown {key}: {', '.join(sorted(str(i) for i in missing))}"
+                )
         
-        return super().create(validated_data)
+        # Duplicates within the batch and against existing rows
+        keys = set()
+        for i, row in enumerate(rows):
+            key = (row['teacher_id'], row['class_id'], row['section_id'], row['subject_id'], row['session_id'])
+            if key in keys:
+                raise serializers.ValidationError(f"Duplicate assignment in batch at row {i+1}.")
+            keys.add(key)
+        existing = TeacherAssignment.objects_raw.filter(
+            teacher_id__in=maps['teacher_id'].keys(),
+            session_id__in=maps['session_id'].keys()
+        ).values_list('teacher_id', 'class_ref_id', 'section_id', 'subject_id', 'session_id')
+        for key in existing:
+            if key in keys:
+                raise serializers.ValidationError("One or more assignments already exist.")
+        
+        self._related_maps = maps
+        return rows
+    
+    @transaction.atomic(savepoint=False)
+    def create(self, validated_data):
+        rows = validated_data.get('assignments', [])
+        if not rows:
+            return []
+        
+        maps = self._related_maps
+        assignments = [
+            TeacherAssignment(
+                teacher=maps['teacher_id'][row['teacher_id']],
+                class_ref=maps['class_id'][row['class_id']],
+                section=maps['section_id'][row['section_id']],
+                subject=maps['subject_id'][row['subject_id']],
+                session=maps['session_id'][row['session_id']],
+                is_active=row['is_active']
+            )
+            for row in rows
+        ]
+        return TeacherAssignment.objects.bulk_create(assignments, batch_size=1000)
 
 
 # ============================================================================
 # Session-Based Enrollment Serializers
 # ============================================================================
 
-class SessionSerializer(serializers.ModelSerializer):
-    """Serializer for academic sessions with lock status."""
-    class Meta:
-        model = Session
-        fields = ['id', 'name', 'start_date', 'end_date', 'is_active', 'is_locked', 'created_at']
-        read_only_fields = ['id', 'created_at']
-
-
 class StudentEnrollmentSerializer(serializers.ModelSerializer):
     """Serializer for student session enrollments."""
-    student_id = serializers.UUIDField(source='student.id', read_only=True)
+    student_id = serializers.UUIDField(read_only=True)
     student_name = serializers.CharField(source='student.name', read_only=True)
     student_permanent_id = serializers.CharField(source='student.student_id', read_only=True)
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True)
     class_name = serializers.CharField(source='class_ref.name', read_only=True)
-    section_id = serializers.UUIDField(source='section.id', read_only=True)
+    section_id = serializers.UUIDField(read_only=True)
     section_name = serializers.CharField(source='section.name', read_only=True)
-    session_id = serializers.UUIDField(source='session.id', read_only=True)
+    session_id = serializers.UUIDField(read_only=True)
     session_name = serializers.CharField(source='session.name', read_only=True)
     
     class Meta:
@@ -661,6 +1090,36 @@ class StudentEnrollmentSerializer(serializers.ModelSerializer):
             'promotion_date', 'remarks', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Join the four FKs and load only the columns this serializer renders."""
+        return queryset.select_related(
+            'student', 'class_ref', 'section', 'session'
+        ).only(
+            'id', 'roll_no', 'status', 'promotion_date', 'remarks', 'created_at',
+            'student__name', 'student__student_id',
+            'class_ref__name', 'section__name', 'session__name'
+        )
+    
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'student_id': str(instance.student_id),
+            'student_name': instance.student.name,
+            'student_permanent_id': instance.student.student_id,
+            'session_id': str(instance.session_id),
+            'session_name': instance.session.name,
+            'class_id': str(instance.class_ref_id),
+            'class_name': instance.class_ref.name,
+            'section_id': str(instance.section_id),
+            'section_name': instance.section.name,
+            'roll_no': instance.roll_no,
+            'status': instance.status,
+            'promotion_date': instance.promotion_date.isoformat() if instance.promotion_date else None,
+            'remarks': instance.remarks,
+            'created_at': _format_datetime(instance.created_at),
+        }
 
 
 class StudentEnrollmentCreateSerializer(serializers.ModelSerializer):
@@ -676,21 +1135,23 @@ class StudentEnrollmentCreateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def validate(self, data):
-        session = Session.objects.get(id=data['session_id'])
+        try:
+            session = _context_get(self.context, 'sessions', Session, data['session_id'])
+        except Session.DoesNotExist:
+            raise serializers.ValidationError("Session not found.")
         if session.is_locked:
             raise serializers.ValidationError("Cannot create enrollment in a locked session.")
+        data['session'] = session
         return data
     
     def create(self, validated_data):
-        student_id = validated_data.pop('student_id')
-        class_id = validated_data.pop('class_id')
-        section_id = validated_data.pop('section_id')
-        session_id = validated_data.pop('session_id')
+        validated_data.pop('session_id')
         
-        validated_data['student'] = Student.objects.get(id=student_id)
-        validated_data['class_ref'] = Class.objects.get(id=class_id)
-        validated_data['section'] = Section.objects.get(id=section_id)
-        validated_data['session'] = Session.objects.get(id=session_id)
+        # The session was loaded by validate(); the other FK constraints are
+        # checked by the INSERT itself
+        validated_data['student_id'] = validated_data.pop('student_id')
+        validated_data['class_ref_id'] = validated_data.pop('class_id')
+        validated_data['section_id'] = validated_data.pop('section_id')
         
         return super().create(validated_data)
 
@@ -705,7 +1166,7 @@ class StudentPromotionSerializer(serializers.Serializer):
     
     def validate(self, data):
         try:
-            enrollment = StudentEnrollment.objects.get(id=data['enrollment_id'])
+            enrollment = _context_get(self.context, 'enrollments', StudentEnrollment, data['enrollment_id'])
             if enrollment.status != 'active':
                 raise serializers.ValidationError("Only active enrollments can be promoted.")
             data['enrollment'] = enrollment
@@ -713,7 +1174,7 @@ class StudentPromotionSerializer(serializers.Serializer):
             raise serializers.ValidationError("Enrollment not found.")
         
         try:
-            new_session = Session.objects.get(id=data['new_session_id'])
+            new_session = _context_get(self.context, 'sessions', Session, data['new_session_id'])
             if new_session.is_locked:
                 raise serializers.ValidationError("Cannot promote to a locked session.")
             data['new_session'] = new_session
@@ -721,12 +1182,12 @@ class StudentPromotionSerializer(serializers.Serializer):
             raise serializers.ValidationError("New session not found.")
         
         try:
-            data['new_class'] = Class.objects.get(id=data['new_class_id'])
+            data['new_class'] = _context_get(self.context, 'classes', Class, data['new_class_id'])
         except Class.DoesNotExist:
             raise serializers.ValidationError("New class not found.")
         
         try:
-            data['new_section'] = Section.objects.get(id=data['new_section_id'])
+            data['new_section'] = _context_get(self.context, 'sections', Section, data['new_section_id'])
         except Section.DoesNotExist:
             raise serializers.ValidationError("New section not found.")
         
@@ -746,19 +1207,23 @@ class BulkPromotionSerializer(serializers.Serializer):
     """Serializer for bulk promoting students."""
     promotions = StudentPromotionSerializer(many=True)
     
+    def to_internal_value(self, data):
+        # Load every enrollment/session/class/section the batch references up
+        # front; each row's validate() then reads them from the shared context
+        promotions = data.get('promotions') if isinstance(data, dict) else None
+        if isinstance(promotions, list):
+            rows = [row for row in promotions if isinstance(row, dict)]
+            self.context['enrollments'] = StudentEnrollment.objects.select_related('student').in_bulk(
+                _context_ids(rows, 'enrollment_id')
+            )
+            self.context['sessions'] = Session.objects.in_bulk(_context_ids(rows, 'new_session_id'))
+            self.context['classes'] = Class.objects.in_bulk(_context_ids(rows, 'new_class_id'))
+            self.context['sections'] = Section.objects.in_bulk(_context_ids(rows, 'new_section_id'))
+        return super().to_internal_value(data)
+    
     @transaction.atomic
     def create(self, validated_data):
-        results = []
-        for promotion_data in validated_data['promotions']:
-            enrollment = promotion_data['enrollment']
-            new_enrollment = enrollment.promote_to_next_class(
-                new_class=promotion_data['new_class'],
-                new_section=promotion_data['new_section'],
-                new_session=promotion_data['new_session'],
-                new_roll_no=promotion_data['new_roll_no']
-            )
-            results.append(new_enrollment)
-        return results
+        return StudentEnrollment.bulk_promote(validated_data['promotions'])
 
 
 class StudentRetentionSerializer(serializers.Serializer):
@@ -769,13 +1234,13 @@ class StudentRetentionSerializer(serializers.Serializer):
     
     def validate(self, data):
         try:
-            enrollment = StudentEnrollment.objects.get(id=data['enrollment_id'])
+            enrollment = _context_get(self.context, 'enrollments', StudentEnrollment, data['enrollment_id'])
             data['enrollment'] = enrollment
         except StudentEnrollment.DoesNotExist:
             raise serializers.ValidationError("Enrollment not found.")
         
         try:
-            data['new_session'] = Session.objects.get(id=data['new_session_id'])
+            data['new_session'] = _context_get(self.context, 'sessions', Session, data['new_session_id'])
         except Session.DoesNotExist:
             raise serializers.ValidationError("New session not found.")
         
@@ -814,13 +1279,13 @@ class StudentTransferSerializer(serializers.Serializer):
 
 class ClassTeacherSerializer(serializers.ModelSerializer):
     """Serializer for class teacher assignments."""
-    teacher_id = serializers.UUIDField(source='teacher.id', read_only=True)
+    teacher_id = serializers.UUIDField(read_only=True)
     teacher_name = serializers.CharField(source='teacher.name', read_only=True)
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True)
     class_name = serializers.CharField(source='class_ref.name', read_only=True)
-    section_id = serializers.UUIDField(source='section.id', read_only=True)
+    section_id = serializers.UUIDField(read_only=True)
     section_name = serializers.CharField(source='section.name', read_only=True)
-    session_id = serializers.UUIDField(source='session.id', read_only=True)
+    session_id = serializers.UUIDField(read_only=True)
     session_name = serializers.CharField(source='session.name', read_only=True)
     
     class Meta:
@@ -875,7 +1340,7 @@ class ClassTeacherCreateSerializer(serializers.ModelSerializer):
 
 class CocurricularTeacherAssignmentSerializer(serializers.ModelSerializer):
     """Serializer for cocurricular teacher assignments."""
-    teacher_id = serializers.UUIDField(source='teacher.id', read_only=True)
+    teacher_id = serializers.UUIDField(read_only=True)
     teacher_name = serializers.CharField(source='teacher.name', read_only=True)
     cocurricular_subject_name = serializers.CharField(source='cocurricular_subject.name', read_only=True)
     class_name = serializers.CharField(source='class_ref.name', read_only=True)
@@ -926,7 +1391,7 @@ class CocurricularTeacherAssignmentCreateSerializer(serializers.ModelSerializer)
 
 class OptionalTeacherAssignmentSerializer(serializers.ModelSerializer):
     """Serializer for optional subject teacher assignments."""
-    teacher_id = serializers.UUIDField(source='teacher.id', read_only=True)
+    teacher_id = serializers.UUIDField(read_only=True)
     teacher_name = serializers.CharField(source='teacher.name', read_only=True)
     optional_subject_name = serializers.CharField(source='optional_subject.name', read_only=True)
     class_name = serializers.CharField(source='class_ref.name', read_only=True)
@@ -2,8 +2,11 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import (
     Session, Class, Section, Subject, 
-    CocurricularSubject, OptionalSubject, Teacher
+    CocurricularSubject, OptionalSubject, Teacher,
+    ClassSubjectAssignment, ClassOptionalConfig, ClassOptionalAssignment,
+    ClassCocurricularConfig, ClassMarksDistribution, Student
 )
+from payments_management.models import StudentFee
 from .cache_utils import invalidate_model_cache
 
 @receiver(post_save, sender=Session)
@@ -40,3 +43,23 @@ def invalidate_optional_subject_cache(sender, instance, **kwargs):
 @receiver(post_delete, sender=Teacher)
 def invalidate_teacher_cache(sender, instance, **kwargs):
     invalidate_model_cache('teacher')
+
+@receiver(post_save, sender=ClassSubjectAssignment)
+@receiver(post_delete, sender=ClassSubjectAssignment)
+@receiver(post_save, sender=ClassOptionalConfig)
+@receiver(post_delete, sender=ClassOptionalConfig)
+@receiver(post_save, sender=ClassOptionalAssignment)
+@receiver(post_delete, sender=ClassOptionalAssignment)
+@receiver(post_save, sender=ClassCocurricularConfig)
+@receiver(post_delete, sender=ClassCocurricularConfig)
+@receiver(post_save, sender=ClassMarksDistribution)
+@receiver(post_delete, sender=ClassMarksDistribution)
+def invalidate_class_config_cache(sender, instance, **kwargs):
+    invalidate_model_cache(sender.__name__)
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=StudentFee)
+@receiver(post_delete, sender=StudentFee)
+def invalidate_pending_fees_cache(sender, instance, **kwargs):
+    invalidate_model_cache(sender.__name__)
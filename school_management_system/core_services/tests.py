@@ -1,3 +1,92 @@
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import (
+    Class, ClassOptionalAssignment, ClassSubjectAssignment, CustomUser,
+    OptionalSubject, School, Subject,
+)
+
+
+class ClassAssignmentBulkUpsertTests(TestCase):
+    """bulk-upsert on the class subject/optional assignment endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(name='School A', code='A')
+        cls.other_school = School.objects.create(name='School B', code='B')
+        cls.admin = CustomUser.objects.create_user(
+            username='admin-a', email='admin@a.test', password='pass', role='admin', school=cls.school
+        )
+        cls.class_obj = Class.objects.create(school=cls.school, name='Class 1')
+        cls.other_class = Class.objects.create(school=cls.other_school, name='Class 1')
+        cls.maths = Subject.objects.create(school=cls.school, name='Maths', code='M')
+        cls.science = Subject.objects.create(school=cls.school, name='Science', code='S')
+        cls.music = OptionalSubject.objects.create(school=cls.school, name='Music', code='MU')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.subjects_url = reverse('classsubjectassignment-bulk-upsert')
+        self.optional_url = reverse('classoptionalassignment-bulk-upsert')
+
+    def test_subject_upsert_returns_stored_ids_for_conflicting_rows(self):
+        existing = ClassSubjectAssignment.objects.create(
+            class_ref=self.class_obj, subject=self.maths, is_required=True
+        )
+        response = self.client.post(self.subjects_url, {
+            'class_id': str(self.class_obj.pk),
+            'assignments': [
+                {'subject_id': str(self.maths.pk), 'is_required': False},
+                {'subject_id': str(self.science.pk)},
+            ],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        stored = dict(ClassSubjectAssignment.objects.filter(
+            class_ref=self.class_obj
+        ).values_list('subject_id', 'id'))
+        self.assertEqual(len(stored), 2)
+        self.assertEqual(
+            {row['id'] for row in response.json()},
+            {str(pk) for pk in stored.values()}
+        )
+        self.assertEqual(stored[self.maths.pk], existing.pk)
+        existing.refresh_from_db()
+        self.assertFalse(existing.is_required)
+
+    def test_optional_upsert_returns_stored_ids_for_conflicting_rows(self):
+        existing = ClassOptionalAssignment.objects.create(
+            class_ref=self.class_obj, optional_subject=self.music, full_marks=50
+        )
+        response = self.client.post(self.optional_url, {
+            'class_id': str(self.class_obj.pk),
+            'assignments': [{'optional_subject_id': str(self.music.pk), 'full_marks': 80}],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()], [str(existing.pk)])
+        existing.refresh_from_db()
+        self.assertEqual(existing.full_marks, 80)
+
+    def test_class_of_another_school_is_not_found(self):
+        for class_id in (str(self.other_class.pk), 'not-a-uuid'):
+            response = self.client.post(self.subjects_url, {
+                'class_id': class_id,
+                'assignments': [{'subject_id': str(self.maths.pk)}],
+            }, format='json')
+            self.assertEqual(response.status_code, 404)
+        self.assertFalse(ClassSubjectAssignment.objects.exists())
+
+    def test_duplicate_subject_in_batch_is_rejected(self):
+        response = self.client.post(self.subjects_url, {
+            'class_id': str(self.class_obj.pk),
+            'assignments': [
+                {'subject_id': str(self.maths.pk)},
+                {'subject_id': str(self.maths.pk).upper()},
+            ],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('subject_id', response.json())
+        self.assertFalse(ClassSubjectAssignment.objects.exists())
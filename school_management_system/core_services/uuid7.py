@@ -0,0 +1,44 @@
+"""
+Time-ordered UUID generation (UUIDv7, RFC 9562).
+
+UUIDv7 values start with a millisecond Unix timestamp, so new primary keys
+are appended near the end of the B-tree index instead of scattered across
+random pages like UUIDv4.
+"""
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_seq = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a UUIDv7: 48-bit Unix ms timestamp, 12-bit rand_a, 62-bit rand_b.
+    rand_a doubles as a counter within the same millisecond so values
+    generated by one process are strictly increasing.
+    """
+    global _last_ms, _last_seq
+    rand = int.from_bytes(os.urandom(10), 'big')
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            seq = rand >> 68  # fresh random 12-bit start
+        else:
+            ms = _last_ms
+            seq = _last_seq + 1
+            if seq > 0xFFF:
+                # Counter exhausted: borrow the next millisecond
+                ms += 1
+                seq = 0
+        _last_ms, _last_seq = ms, seq
+
+    value = (ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= seq << 64
+    value |= 0b10 << 62
+    value |= rand & 0x3FFFFFFFFFFFFFFF
+    return uuid.UUID(int=value)
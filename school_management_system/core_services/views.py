@@ -3,11 +3,13 @@ Views for Core Services API.
 """
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.throttling import AnonRateThrottle
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.db.models import Q
+from django.db.models import ProtectedError, Q
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.cache import cache
 from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
@@ -31,9 +33,13 @@ from .serializers import (
     ClassCocurricularConfigSerializer, ClassMarksDistributionSerializer,
     SchoolConfigSerializer, StudentSerializer, StudentCreateSerializer,
     StudentDetailSerializer, BulkStudentCreateSerializer,
-    StudentLoginSerializer, TeacherAssignmentSerializer, TeacherAssignmentCreateSerializer
+    StudentLoginSerializer, TeacherAssignmentSerializer, TeacherAssignmentCreateSerializer,
+    BulkTeacherAssignmentCreateSerializer
+)
+from .cache_utils import (
+    CacheMixin, CACHE_IS_SHARED, CACHE_KEYS, CACHE_TTL_LONG, CACHE_TTL_MEDIUM,
+    get_cache_version, get_or_build_json, invalidate_model_cache
 )
-from .cache_utils import CacheMixin, CACHE_TTL_LONG, CACHE_TTL_MEDIUM, invalidate_model_cache
 
 
 # ============================================================================
@@ -124,6 +130,17 @@ class SchoolScopedMixin:
             serializer.save(school=user.school)
 
 
+def get_school_class(request, class_id):
+    """
+    The Class with this id in the requesting user's school.
+    Raises NotFound for malformed ids and for classes of other schools.
+    """
+    try:
+        return Class.objects.only('id').get(pk=class_id, school=request.user.school)
+    except (Class.DoesNotExist, DjangoValidationError):
+        raise NotFound('Class not found.')
+
+
 class SchoolViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing schools.
@@ -325,7 +342,7 @@ class SessionViewSet(SchoolScopedMixin, CacheMixin, viewsets.ModelViewSet):
     cache_timeout = CACHE_TTL_LONG
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'purge']:
             return [IsAdminUser()]
         return [permissions.IsAuthenticated()]
     
@@ -340,6 +357,24 @@ class SessionViewSet(SchoolScopedMixin, CacheMixin, viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         super().perform_destroy(instance)
         invalidate_model_cache('session')
+    
+    def destroy(self, request, *args, **kwargs):
+        try:
+            return super().destroy(request, *args, **kwargs)
+        except ProtectedError:
+            return Response({
+                'error': 'Session has enrollments or teacher assignments.',
+                'message': 'Use the purge action to delete the session together with its records.'
+            }, status=status.HTTP_409_CONFLICT)
+    
+    @action(detail=True, methods=['post'], url_path='purge')
+    def purge(self, request, pk=None):
+        """Delete a session and its dependent records in batches."""
+        session = self.get_object()
+        session.archive_and_drop()
+        self.invalidate_list_cache()
+        invalidate_model_cache('session')
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class ClassViewSet(SchoolScopedMixin, CacheMixin, viewsets.ModelViewSet):
@@ -372,10 +407,21 @@ class ClassViewSet(SchoolScopedMixin, CacheMixin, viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'], url_path='config')
     def get_config(self, request, pk=None):
-        """Get all configurations for a class in a single request."""
+        """
+        Get all configurations for a class in a single request.
+        With a shared cache backend, the payload is cached per class and rebuilt
+        only after one of its source models changes (see CLASS_CONFIG_MODELS in
+        cache_utils). A per-process backend would keep serving other workers'
+        stale copies for CACHE_TTL_LONG, so there it is built on every request.
+        """
         class_obj = self.get_object()
-        
-        # Get all configs in parallel using select_related where applicable
+        if not CACHE_IS_SHARED:
+            return Response(self._build_config(class_obj))
+        prefix = CACHE_KEYS['class_config']
+        cache_key = f"{prefix}:v{get_cache_version(prefix)}:{class_obj.pk}"
+        return Response(get_or_build_json(cache_key, lambda: self._build_config(class_obj)))
+    
+    def _build_config(self, class_obj):
         sections = list(class_obj.sections.all())
         subject_assignments = list(ClassSubjectAssignment.objects.filter(
             class_ref=class_obj
@@ -387,7 +433,7 @@ class ClassViewSet(SchoolScopedMixin, CacheMixin, viewsets.ModelViewSet):
         cocurricular_config = ClassCocurricularConfig.objects.filter(class_ref=class_obj).first()
         marks_distribution = ClassMarksDistribution.objects.filter(class_ref=class_obj).first()
         
-        return Response({
+        return {
             'class': ClassSerializer(class_obj).data,
             'sections': SectionSerializer(sections, many=True).data,
             'subject_assignments': ClassSubjectAssignmentSerializer(subject_assignments, many=True).data,
@@ -395,7 +441,7 @@ class ClassViewSet(SchoolScopedMixin, CacheMixin, viewsets.ModelViewSet):
             'optional_assignments': ClassOptionalAssignmentSerializer(optional_assignments, many=True).data,
             'cocurricular_config': ClassCocurricularConfigSerializer(cocurricular_config).data if cocurricular_config else None,
             'marks_distribution': ClassMarksDistributionSerializer(marks_distribution).data if marks_distribution else None,
-        })
+        }
 
 
 class SectionViewSet(CacheMixin, viewsets.ModelViewSet):
@@ -550,7 +596,7 @@ class ClassSubjectAssignmentViewSet(viewsets.ModelViewSet):
     filterset_fields = ['class_ref', 'subject', 'is_required']
     
     def get_queryset(self):
-        queryset = ClassSubjectAssignment.objects.select_related('subject', 'class_ref')
+        queryset = ClassSubjectAssignment.objects.select_related('subject')
         user = self.request.user
         if not user.is_authenticated:
             return queryset.none()
@@ -567,10 +613,12 @@ class ClassSubjectAssignmentViewSet(viewsets.ModelViewSet):
         class_id = self.request.query_params.get('class_id')
         if class_id:
             queryset = queryset.filter(class_ref_id=class_id)
+        if self.action in ['list', 'retrieve']:
+            queryset = ClassSubjectAssignmentSerializer.setup_eager_loading(queryset)
         return queryset
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_upsert']:
             return [IsAdminUser()]
         return [permissions.IsAuthenticated()]
     
@@ -617,8 +665,32 @@ class ClassSubjectAssignmentViewSet(viewsets.ModelViewSet):
             
         if new_assignments:
             ClassSubjectAssignment.objects.bulk_create(new_assignments)
+            # bulk_create skips post_save
+            invalidate_model_cache('classsubjectassignment')
             
         return Response({'status': 'success', 'message': 'Assignments updated successfully'})
+    
+    @action(detail=False, methods=['post'], url_path='bulk-upsert')
+    def bulk_upsert(self, request):
+        """
+        Create or update many subject assignments for a class in one statement.
+        Body: {"class_id": ..., "assignments": [{"subject_id": ..., "is_required": ...}, ...]}
+        """
+        class_id = request.data.get('class_id')
+        if not class_id:
+            return Response({'error': 'class_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+        class_obj = get_school_class(request, class_id)
+        
+        serializer = ClassSubjectAssignmentSerializer(
+            data=request.data.get('assignments', []),
+            many=True,
+            context={**self.get_serializer_context(), 'class_id': class_obj.pk}
+        )
+        serializer.is_valid(raise_exception=True)
+        assignments = serializer.save()
+        # bulk_create skips post_save
+        invalidate_model_cache('classsubjectassignment')
+        return Response(ClassSubjectAssignmentSerializer(assignments, many=True).data)
 
 
 class ClassOptionalConfigViewSet(viewsets.ModelViewSet):
@@ -713,11 +785,35 @@ class ClassOptionalAssignmentViewSet(viewsets.ModelViewSet):
             
         if new_assignments:
             ClassOptionalAssignment.objects.bulk_create(new_assignments)
+            # bulk_create skips post_save
+            invalidate_model_cache('classoptionalassignment')
             
         return Response({'status': 'success', 'message': 'Optional assignments updated successfully'})
     
+    @action(detail=False, methods=['post'], url_path='bulk-upsert')
+    def bulk_upsert(self, request):
+        """
+        Create or update many optional subject assignments for a class in one statement.
+        Body: {"class_id": ..., "assignments": [{"optional_subject_id": ..., "full_marks": ..., "is_required": ...}, ...]}
+        """
+        class_id = request.data.get('class_id')
+        if not class_id:
+            return Response({'error': 'class_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+        class_obj = get_school_class(request, class_id)
+        
+        serializer = ClassOptionalAssignmentSerializer(
+            data=request.data.get('assignments', []),
+            many=True,
+            context={**self.get_serializer_context(), 'class_id': class_obj.pk}
+        )
+        serializer.is_valid(raise_exception=True)
+        assignments = serializer.save()
+        # bulk_create skips post_save
+        invalidate_model_cache('classoptionalassignment')
+        return Response(ClassOptionalAssignmentSerializer(assignments, many=True).data)
+    
     def get_queryset(self):
-        queryset = ClassOptionalAssignment.objects.select_related('class_ref', 'optional_subject')
+        queryset = ClassOptionalAssignment.objects.select_related('optional_subject')
         user = self.request.user
         if not user.is_authenticated:
             return queryset.none()
@@ -734,10 +830,12 @@ class ClassOptionalAssignmentViewSet(viewsets.ModelViewSet):
         class_id = self.request.query_params.get('class_id')
         if class_id:
             queryset = queryset.filter(class_ref_id=class_id)
+        if self.action in ['list', 'retrieve']:
+            queryset = ClassOptionalAssignmentSerializer.setup_eager_loading(queryset)
         return queryset
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_upsert']:
             return [IsAdminUser()]
         return [permissions.IsAuthenticated()]
     
@@ -794,8 +892,10 @@ class ClassMarksDistributionViewSet(viewsets.ModelViewSet):
     """ViewSet for class marks distribution."""
     queryset = ClassMarksDistribution.objects.all()
     serializer_class = ClassMarksDistributionSerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['class_ref']
+    # total_marks is a stored generated column, so it sorts in SQL
+    ordering_fields = ['total_marks', 'created_at']
     ordering = ['created_at']
     
     def get_queryset(self):
@@ -913,7 +1013,9 @@ class StudentViewSet(SchoolScopedMixin, viewsets.ModelViewSet):
         from django.db.models import IntegerField
         from django.db.models.functions import Cast
         
-        queryset = super().get_queryset().select_related('class_ref', 'section', 'session')
+        queryset = StudentSerializer.setup_eager_loading(super().get_queryset())
+        if self.action in ['list', 'retrieve']:
+            queryset = queryset.for_detail()
         class_id = self.request.query_params.get('class_id')
         section_id = self.request.query_params.get('section_id')
         session_id = self.request.query_params.get('session_id')
@@ -951,8 +1053,12 @@ class StudentViewSet(SchoolScopedMixin, viewsets.ModelViewSet):
         serializer = BulkStudentCreateSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         students = serializer.save()
+        # Large imports only need the generated identifiers back, not full records
         return Response(
-            StudentSerializer(students, many=True).data,
+            [
+                {'id': str(student.id), 'student_id': student.student_id, 'roll_no': student.roll_no}
+                for student in students
+            ],
             status=status.HTTP_201_CREATED
         )
 
@@ -1212,6 +1318,8 @@ class TeacherAssignmentViewSet(CacheMixin, viewsets.ModelViewSet):
     
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.action in ['list', 'retrieve']:
+            queryset = TeacherAssignmentSerializer.setup_eager_loading(queryset)
         
         # Filter by teacher_id for teacher's own assignments
         teacher_id = self.request.query_params.get('teacher_id')
@@ -1245,6 +1353,19 @@ class TeacherAssignmentViewSet(CacheMixin, viewsets.ModelViewSet):
     def perform_destroy(self, instance):
         super().perform_destroy(instance)
         invalidate_model_cache('teacherassignment')
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """Bulk create teacher assignments."""
+        serializer = BulkTeacherAssignmentCreateSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        assignments = serializer.save()
+        self.invalidate_list_cache()
+        invalidate_model_cache('teacherassignment')
+        return Response(
+            TeacherAssignmentSerializer(assignments, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
 
 
 class MyAssignmentsView(APIView):
@@ -1262,7 +1383,7 @@ class MyAssignmentsView(APIView):
         teacher = user.teacher_profile
         
         # Get active session
-        active_session = Session.objects.filter(is_active=True).first()
+        active_session = Session.get_active_cached()
         
         # Get teacher's assignments
         assignments = TeacherAssignment.objects.filter(
@@ -1299,7 +1420,7 @@ class MyPendingTasksView(APIView):
         teacher = user.teacher_profile
         
         # Get active session
-        active_session = Session.objects.filter(is_active=True).first()
+        active_session = Session.get_active_cached()
         if not active_session:
             return Response({
                 'teacher': TeacherSerializer(teacher).data,
@@ -1407,7 +1528,7 @@ class AdminDashboardStatsView(APIView):
         from decimal import Decimal
         
         # Get active session
-        active_session = Session.objects.filter(is_active=True).first()
+        active_session = Session.get_active_cached()
         
         # Basic counts
         total_students = Student.objects.filter(is_active=True).count()
@@ -1515,6 +1636,10 @@ class StudentEnrollmentViewSet(viewsets.ModelViewSet):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
         
+        if self.action in ['list', 'retrieve']:
+            from .serializers import StudentEnrollmentSerializer
+            queryset = StudentEnrollmentSerializer.setup_eager_loading(queryset)
+        
         return queryset
     
     @action(detail=False, methods=['post'], url_path='promote')
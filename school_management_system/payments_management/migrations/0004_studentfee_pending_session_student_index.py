@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_services', '0016_created_at_db_default'),
+        ('payments_management', '0003_feediscount_school_feestructure_school_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentfee',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'partial', 'overdue'])), fields=['session', 'student'], name='idx_fee_pending_ses_stu'),
+        ),
+    ]
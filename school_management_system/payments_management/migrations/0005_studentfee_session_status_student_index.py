@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_services', '0016_created_at_db_default'),
+        ('payments_management', '0004_studentfee_pending_session_student_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentfee',
+            index=models.Index(fields=['session', 'status', 'student'], name='idx_fee_ses_status_stu'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 """
 Payments Management Models - Models for managing student fees and payments.
 """
+import time
 import uuid
 from django.db import models
 from django.utils import timezone
@@ -184,6 +185,17 @@ class StudentFee(models.Model):
                 name='idx_studentfee_pending',
                 condition=models.Q(status__in=['pending', 'partial', 'overdue'])
             ),
+            # Fee-clearance check: unpaid fees of a session, probed per student
+            models.Index(
+                fields=['session', 'student'],
+                name='idx_fee_pending_ses_stu',
+                condition=models.Q(status__in=['pending', 'partial', 'overdue'])
+            ),
+            # Admin reports filtering a session's fees by status
+            models.Index(
+                fields=['session', 'status', 'student'],
+                name='idx_fee_ses_status_stu'
+            ),
             # Index for due date queries
             models.Index(
                 fields=['due_date', 'status'],
@@ -291,7 +303,6 @@ class Payment(models.Model):
     def save(self, *args, **kwargs):
         # Generate receipt number if not provided
         if not self.receipt_number:
-            import time
             self.receipt_number = f"RCP-{int(time.time() * 1000)}"
         super().save(*args, **kwargs)
         
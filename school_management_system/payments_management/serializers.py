@@ -9,8 +9,8 @@ from core_services.models import Student, Class, Session
 
 class FeeStructureSerializer(serializers.ModelSerializer):
     """Serializer for fee structures."""
-    class_id = serializers.UUIDField(source='class_ref.id', read_only=True)
-    session_id = serializers.UUIDField(source='session.id', read_only=True)
+    class_id = serializers.UUIDField(source='class_ref_id', read_only=True)
+    session_id = serializers.UUIDField(read_only=True)
     total_fee = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     
     class Meta:
@@ -68,10 +68,10 @@ class FeeDiscountSerializer(serializers.ModelSerializer):
 
 class StudentFeeSerializer(serializers.ModelSerializer):
     """Serializer for student fees."""
-    student_id = serializers.UUIDField(source='student.id', read_only=True)
-    fee_structure_id = serializers.UUIDField(source='fee_structure.id', read_only=True)
-    session_id = serializers.UUIDField(source='session.id', read_only=True)
-    discount_id = serializers.UUIDField(source='discount.id', read_only=True, allow_null=True)
+    student_id = serializers.UUIDField(read_only=True)
+    fee_structure_id = serializers.UUIDField(read_only=True)
+    session_id = serializers.UUIDField(read_only=True)
+    discount_id = serializers.UUIDField(read_only=True, allow_null=True)
     balance_amount = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     
     class Meta:
@@ -127,8 +127,8 @@ class StudentFeeDetailSerializer(StudentFeeSerializer):
 
 class PaymentSerializer(serializers.ModelSerializer):
     """Serializer for payments."""
-    student_fee_id = serializers.UUIDField(source='student_fee.id', read_only=True)
-    received_by_id = serializers.UUIDField(source='received_by.id', read_only=True, allow_null=True)
+    student_fee_id = serializers.UUIDField(read_only=True)
+    received_by_id = serializers.UUIDField(read_only=True, allow_null=True)
     
     class Meta:
         model = Payment
@@ -175,7 +175,7 @@ class PaymentDetailSerializer(PaymentSerializer):
 
 class PaymentReminderSerializer(serializers.ModelSerializer):
     """Serializer for payment reminders."""
-    student_fee_id = serializers.UUIDField(source='student_fee.id', read_only=True)
+    student_fee_id = serializers.UUIDField(read_only=True)
     
     class Meta:
         model = PaymentReminder
@@ -13,9 +13,9 @@ from core_services.models import Student, Subject, Session, CocurricularSubject,
 
 class StudentResultSerializer(serializers.ModelSerializer):
     """Serializer for student results."""
-    student_id = serializers.UUIDField(source='student.id', read_only=True)
-    subject_id = serializers.UUIDField(source='subject.id', read_only=True)
-    session_id = serializers.UUIDField(source='session.id', read_only=True)
+    student_id = serializers.UUIDField(read_only=True)
+    subject_id = serializers.UUIDField(read_only=True)
+    session_id = serializers.UUIDField(read_only=True)
     
     class Meta:
         model = StudentResult
@@ -164,9 +164,9 @@ class BulkStudentResultUpsertSerializer(serializers.Serializer):
 
 class StudentCocurricularResultSerializer(serializers.ModelSerializer):
     """Serializer for student co-curricular results."""
-    student_id = serializers.UUIDField(source='student.id', read_only=True)
-    cocurricular_subject_id = serializers.UUIDField(source='cocurricular_subject.id', read_only=True)
-    session_id = serializers.UUIDField(source='session.id', read_only=True)
+    student_id = serializers.UUIDField(read_only=True)
+    cocurricular_subject_id = serializers.UUIDField(read_only=True)
+    session_id = serializers.UUIDField(read_only=True)
     total_marks = serializers.IntegerField(read_only=True)
     
     class Meta:
@@ -221,9 +221,9 @@ class StudentCocurricularResultDetailSerializer(StudentCocurricularResultSeriali
 
 class StudentOptionalResultSerializer(serializers.ModelSerializer):
     """Serializer for student optional results."""
-    student_id = serializers.UUIDField(source='student.id', read_only=True)
-    optional_subject_id = serializers.UUIDField(source='optional_subject.id', read_only=True)
-    session_id = serializers.UUIDField(source='session.id', read_only=True)
+    student_id = serializers.UUIDField(read_only=True)
+    optional_subject_id = serializers.UUIDField(read_only=True)
+    session_id = serializers.UUIDField(read_only=True)
     
     class Meta:
         model = StudentOptionalResult
@@ -7,6 +7,8 @@ Authorization Rules (Backend-Enforced):
 - Admin has full academic override
 - If student fees are not cleared → Result and Marksheet generation must be blocked
 """
+import uuid
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -28,7 +30,8 @@ from core_services.views import IsAdminUser, SchoolScopedMixin
 from core_services.models import Student, Subject
 from core_services.permissions import (
     IsAdminOrTeacher, SessionNotLocked, 
-    validate_marks_entry_permission, check_teacher_subject_assignment
+    validate_marks_entry_permission, validate_bulk_marks_entry_permission,
+    check_teacher_subject_assignment, get_request_session
 )
 
 
@@ -87,7 +90,10 @@ class StudentResultViewSet(SchoolScopedMixin, viewsets.ModelViewSet):
                 from core_services.models import Session
                 student = Student.objects.select_related('class_ref', 'section').get(id=student_id)
                 subject = Subject.objects.get(id=subject_id)
-                session = Session.objects.get(id=session_id)
+                # Projected, per-request memoized session lookup
+                session = get_request_session(request, session_id)
+                if session is None:
+                    raise Session.DoesNotExist
                 
                 is_allowed, error_msg = validate_marks_entry_permission(user, student, subject, session)
                 if not is_allowed:
@@ -111,23 +117,32 @@ class StudentResultViewSet(SchoolScopedMixin, viewsets.ModelViewSet):
         if user.role == 'teacher':
             results_data = request.data.get('results', [])
             if results_data:
-                # Check first result's subject for authorization
-                first_result = results_data[0]
-                student_id = first_result.get('student_id')
-                subject_id = first_result.get('subject_id')
-                session_id = first_result.get('session_id')
-                
+                # Authorize every row: load students and sessions once, then one batched assignment check
+                from core_services.models import Session
+                # Key both sides on UUID objects so any valid spelling of an id matches
                 try:
-                    from core_services.models import Session
-                    student = Student.objects.select_related('class_ref', 'section').get(id=student_id)
-                    subject = Subject.objects.get(id=subject_id)
-                    session = Session.objects.get(id=session_id)
-                    
-                    is_allowed, error_msg = validate_marks_entry_permission(user, student, subject, session)
-                    if not is_allowed:
-                        return Response({'error': error_msg}, status=status.HTTP_403_FORBIDDEN)
-                except (Student.DoesNotExist, Subject.DoesNotExist, Session.DoesNotExist):
+                    row_ids = [
+                        (uuid.UUID(str(row.get('student_id'))), uuid.UUID(str(row.get('session_id'))))
+                        for row in results_data
+                    ]
+                except ValueError:
+                    row_ids = None
+                if row_ids is not None:
+                    student_ids = {student_id for student_id, _ in row_ids}
+                    session_ids = {session_id for _, session_id in row_ids}
+                    students = Student.objects.only('id', 'class_ref_id', 'section_id').in_bulk(student_ids)
+                    sessions = Session.objects.only('id', 'is_locked').in_bulk(session_ids)
+                
+                if row_ids is None or len(students) != len(student_ids) or len(sessions) != len(session_ids):
                     return Response({'error': 'Invalid student, subject, or session ID'}, status=status.HTTP_400_BAD_REQUEST)
+                
+                entries = [
+                    (students[student_id], row.get('subject_id'), sessions[session_id])
+                    for row, (student_id, session_id) in zip(results_data, row_ids)
+                ]
+                is_allowed, error_msg = validate_bulk_marks_entry_permission(user, entries)
+                if not is_allowed:
+                    return Response({'error': error_msg}, status=status.HTTP_403_FORBIDDEN)
         
         serializer = BulkStudentResultUpsertSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -174,7 +189,7 @@ class StudentResultViewSet(SchoolScopedMixin, viewsets.ModelViewSet):
             session_id=session_id,
             class_ref_id=class_id,
             section_id=section_id
-        ).order_by('roll_no')
+        ).for_roster().order_by('roll_no')
         
         # Get existing results
         results = StudentResult.objects.filter(
@@ -220,7 +220,7 @@ AUTH_USER_MODEL = 'core_services.CustomUser'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core_services.authentication.ProfileJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -234,7 +234,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'core_services.renderers.ORJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     # Rate limiting / Throttling
@@ -365,6 +365,9 @@ CACHE_TTL_SHORT = 60       # 1 minute - for frequently changing data
 CACHE_TTL_MEDIUM = 300     # 5 minutes - for moderately stable data  
 CACHE_TTL_LONG = 900       # 15 minutes - for stable reference data (classes, subjects)
 
+# Write cache-miss responses from a background thread (enable with Redis)
+CACHE_ASYNC_WRITES = os.environ.get('CACHE_ASYNC_WRITES', 'False').lower() == 'true'
+
 # ============================================================================
 # SECURITY SETTINGS
 # ============================================================================
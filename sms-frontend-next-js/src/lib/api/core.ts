@@ -407,8 +407,8 @@ export const studentsApi = {
     await api.delete(`/students/${id}/`);
   },
 
-  bulkCreate: async (students: Partial<Student>[]): Promise<Student[]> => {
-    return api.post<Student[]>('/students/bulk/', { students });
+  bulkCreate: async (students: Partial<Student>[]): Promise<Array<{ id: string; student_id: string; roll_no: string }>> => {
+    return api.post<Array<{ id: string; student_id: string; roll_no: string }>>('/students/bulk/', { students });
   },
 
   // Create student with profile picture